@@ -0,0 +1,132 @@
+"""
+Bulk, batched translation of whole text files.
+
+    python en_de.py --input book.txt --output book.fr.txt
+
+The input is read as a stream, a window of lines at a time, so memory stays
+bounded on multi-GB files. Inside each window:
+  1. every line is split into sentences
+  2. sentences already in the cache (or repeated in the window) are reused
+  3. the rest are sorted by length and translated in batches, so each batch
+     pads to sentences of about the same size
+  4. translations are put back in their original place and written out line
+     by line, with each line's indentation, the whitespace between its
+     sentences and its blank lines kept as they were
+
+Sentences longer than the model's maximum input are truncated, not failed.
+
+The cache is a small SQLite file keyed on (model, sentence), so a sentence is
+never translated twice - not within a file, and not across runs.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+from model_registry import get_pipeline
+
+SENTENCE_END = re.compile(r"(?<=[.!?])(\s+)")  # the group keeps the separators
+LINE_EDGES = re.compile(r"^(\s*)(.*?)(\s*)$", re.S)
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".translation_cache.sqlite")
+
+
+def split_line(line):
+    """Returns (leading whitespace, sentences, separators between them, trailing whitespace)."""
+    lead, body, trail = LINE_EDGES.match(line).groups()
+    parts = SENTENCE_END.split(body) if body else []
+    return lead, parts[0::2], parts[1::2], trail
+
+
+def join_line(lead, sentences, separators, trail):
+    """Inverse of `split_line`, with `sentences` replaced by their translations."""
+    out = [lead]
+    for n, sentence in enumerate(sentences):
+        if n:
+            out.append(separators[n - 1])
+        out.append(sentence.strip())
+    out.append(trail)
+    return "".join(out)
+
+
+class TranslationCache:
+    """SQLite-backed sentence -> translation store for one model."""
+
+    def __init__(self, path, model):
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, text TEXT)")
+        self.model = model
+
+    def _key(self, sentence):
+        return hashlib.sha256(f"{self.model}\0{sentence}".encode("utf-8")).hexdigest()
+
+    def get_many(self, sentences):
+        found = {}
+        sentences = list(sentences)
+        for i in range(0, len(sentences), 500):  # stay under SQLite's variable limit
+            chunk = {self._key(s): s for s in sentences[i:i + 500]}
+            marks = ",".join("?" * len(chunk))
+            rows = self.db.execute(f"SELECT key, text FROM translations WHERE key IN ({marks})", list(chunk))
+            found.update((chunk[key], text) for key, text in rows)
+        return found
+
+    def put_many(self, pairs):
+        self.db.executemany(
+            "INSERT OR REPLACE INTO translations VALUES (?, ?)",
+            [(self._key(s), t) for s, t in pairs],
+        )
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def translate_batched(translator, sentences, batch_size):
+    """Translates unique sentences sorted by length; returns {sentence: translation}."""
+    ordered = sorted(sentences, key=len)
+    results = {}
+    for i in range(0, len(ordered), batch_size):
+        batch = ordered[i:i + batch_size]
+        outputs = translator(batch, batch_size=len(batch), truncation=True)
+        results.update(zip(batch, (o["translation_text"] for o in outputs)))
+    return results
+
+
+def translate_file(input_path, output_path, model="Helsinki-NLP/opus-mt-en-fr",
+                   batch_size=32, window_lines=2000, cache_path=DEFAULT_CACHE):
+    """Translates `input_path` into `output_path`; returns (sentences, translated, seconds)."""
+    translator = get_pipeline("translation", model)
+    cache = TranslationCache(cache_path, model)
+    total = fresh = 0
+    start = time.perf_counter()
+
+    def flush(lines, out):
+        nonlocal total, fresh
+        split = [split_line(line) for line in lines]
+        unique = {s for _, sentences, _, _ in split for s in sentences}
+        known = cache.get_many(unique)
+        missing = [s for s in unique if s not in known]
+        if missing:
+            new = translate_batched(translator, missing, batch_size)
+            cache.put_many(new.items())
+            known.update(new)
+        for lead, sentences, separators, trail in split:
+            out.write(join_line(lead, [known[s] for s in sentences], separators, trail))
+        total += sum(len(sentences) for _, sentences, _, _ in split)
+        fresh += len(missing)
+
+    try:
+        with open(input_path, encoding="utf-8") as src, open(output_path, "w", encoding="utf-8") as out:
+            window = []
+            for line in src:
+                window.append(line)
+                if len(window) >= window_lines:
+                    flush(window, out)
+                    window = []
+            if window:
+                flush(window, out)
+    finally:
+        cache.close()
+
+    return total, fresh, time.perf_counter() - start
@@ -1,20 +1,56 @@
 # 1. Install the necessary libraries. 'sentencepiece' is often needed for translation models.
 #!pip install transformers sentencepiece
 
-# 2. Import the pipeline tool, our easy way to use models.
-from transformers import pipeline
+import argparse
 
-# 3. Load your 'Translation Team'.
-# This model is specifically an English-to-French translation team.
-# model="Helsinki-NLP/opus-mt-en-fr"
-translator = pipeline("translation", model="Helsinki-NLP/opus-mt-en-fr")
+# 2. Import the shared model registry, our easy way to get (and reuse) models.
+from model_registry import get_pipeline
 
-# 4. Write the English sentence you want the team to translate.
-english_sentence = "The old library at the end of the street contains thousands of ancient books."
+# settings, also read by benchmarks/generation.py
+TASK, MODEL = "translation", "Helsinki-NLP/opus-mt-en-fr"
+PROMPT = "The old library at the end of the street contains thousands of ancient books."
+GENERATE_KWARGS = {}
 
-# 5. Give the sentence to your 'translator' team.
-# BEHIND THE SCENES: The Encoder reads the English, and the Decoder writes the French.
-french_translation = translator(english_sentence)
 
-# 6. Show the result from your French agent!
-print(french_translation[0]['translation_text'])
\ No newline at end of file
+def main():
+    # 3. Load your 'Translation Team'.
+    # This model is specifically an English-to-French translation team.
+    # model="Helsinki-NLP/opus-mt-en-fr"
+    translator = get_pipeline(TASK, MODEL)
+
+    # 4. Write the English sentence you want the team to translate.
+    english_sentence = PROMPT
+
+    # 5. Give the sentence to your 'translator' team.
+    # BEHIND THE SCENES: The Encoder reads the English, and the Decoder writes the French.
+    french_translation = translator(english_sentence, **GENERATE_KWARGS)
+
+    # 6. Show the result from your French agent!
+    print(french_translation[0]['translation_text'])
+
+
+def bulk(args):
+    # Bulk mode: stream a whole file through batched, length-sorted, cached translation.
+    from bulk_translate import translate_file
+
+    total, fresh, seconds = translate_file(
+        args.input, args.output, batch_size=args.batch_size, window_lines=args.window_lines
+    )
+    print(f"✅ {total} sentences ({fresh} newly translated) in {seconds:.1f}s "
+          f"- {total / max(seconds, 1e-9):.1f} sentences/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="English to French translation")
+    parser.add_argument("--input", help="translate a whole text file instead of the demo sentence")
+    parser.add_argument("--output", help="where to write the translation (bulk mode)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--window-lines", type=int, default=2000, help="lines held in memory at once")
+    args = parser.parse_args()
+
+    if args.input:
+        if not args.output:
+            parser.error("--output is required with --input")
+        bulk(args)
+    else:
+        main()
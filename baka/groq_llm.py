@@ -1,21 +1,56 @@
+import argparse
 import os
+import sys
 
 from dotenv import load_dotenv
 load_dotenv()
 from groq import Groq
+from groq.types.chat import ChatCompletion
+
+# shared record/replay response cache (LLM_CACHE=auto/record/replay/off) and
+# token streaming, see llms/llm_cache.py and llms/streaming.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "llms"))
+from llm_cache import default_store  # noqa: E402
+from streaming import stream_chat  # noqa: E402
+
+parser = argparse.ArgumentParser(description="Ask a Groq model one question")
+parser.add_argument("--prompt", default="Explain the importance of fast language models")
+parser.add_argument("--model", default="llama-3.3-70b-versatile")
+parser.add_argument("--no-stream", action="store_true", help="print the answer only once it is complete")
+args = parser.parse_args()
+
+
+def create(**kwargs):
+    # the client is only built when the call really goes to the API
+    client = Groq(
+        api_key=os.environ.get("GROQ_API_KEY"),
+    )
+    return client.chat.completions.create(**kwargs)
 
-client = Groq(
-    api_key=os.environ.get("GROQ_API_KEY"),
-)
 
-chat_completion = client.chat.completions.create(
+request = dict(
     messages=[
         {
             "role": "user",
-            "content": "Explain the importance of fast language models",
+            "content": args.prompt,
         }
     ],
-    model="llama-3.3-70b-versatile",
+    model=args.model,
 )
 
-print(chat_completion.choices[0].message.content)
\ No newline at end of file
+store = default_store()
+if args.no_stream or store.caches(request.get("temperature", 1.0)):
+    # cached (or explicitly non-streaming) calls come back whole
+    chat_completion = store.call(
+        "groq",
+        request,
+        create,
+        dump=lambda r: r.model_dump(),
+        load=ChatCompletion.model_validate,
+    )
+    print(chat_completion.choices[0].message.content)
+else:
+    # tokens are printed as they arrive; metrics go to stderr
+    _, metrics = stream_chat(create, **request)
+    print()
+    print(f"⏱️  {metrics.summary()}", file=sys.stderr)
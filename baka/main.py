@@ -1,10 +1,20 @@
-from transformers import pipeline
+from model_registry import get_pipeline
 
-# Using pre-trained transformers 
-generator = pipeline("text-generation", model="distilgpt2")
+# settings, also read by benchmarks/generation.py
+TASK, MODEL = "text-generation", "distilgpt2"
+PROMPT = "once a upon a time in a toy box there was a,"
+GENERATE_KWARGS = dict(max_new_tokens=50, do_sample=True, pad_token_id=50256, truncation=True)
 
-# Generate a Toy Story 
-prompt = "once a upon a time in a toy box there was a,"
-story = generator(prompt, max_new_tokens=50, do_sample=True, pad_token_id=50256, truncation=True)
 
-print(story[0]["generated_text"])
\ No newline at end of file
+def main():
+    # Using pre-trained transformers (shared through the model registry)
+    generator = get_pipeline(TASK, MODEL)
+
+    # Generate a Toy Story 
+    story = generator(PROMPT, **GENERATE_KWARGS)
+
+    print(story[0]["generated_text"])
+
+
+if __name__ == "__main__":
+    main()
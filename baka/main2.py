@@ -1,10 +1,20 @@
-from transformers import pipeline
+from model_registry import get_pipeline
 
-#Using pre tarained model for chatbot
-generator = pipeline("text-generation", model ='gpt2')
+# settings, also read by benchmarks/generation.py
+TASK, MODEL = "text-generation", "gpt2"
+PROMPT = "you are a poetry chatbot, write a poem about the moon"
+GENERATE_KWARGS = dict(max_length=50, num_return_sequences=1)
 
-#Making a chatbot function
-promt = "you are a poetry chatbot, write a poem about the moon"
-answer = generator(promt, max_length=50, num_return_sequences=1)
 
-print(answer[0]['generated_text'])
\ No newline at end of file
+def main():
+    #Using pre tarained model for chatbot
+    generator = get_pipeline(TASK, MODEL)
+
+    #Making a chatbot function
+    answer = generator(PROMPT, **GENERATE_KWARGS)
+
+    print(answer[0]['generated_text'])
+
+
+if __name__ == "__main__":
+    main()
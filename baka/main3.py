@@ -1,10 +1,20 @@
-from transformers import pipeline
+from model_registry import get_pipeline
 
-# Initialize the text generation pipeline with the GPT-2 model
-generation = pipeline("text-generation", model="gpt2")
+# settings, also read by benchmarks/generation.py
+TASK, MODEL = "text-generation", "gpt2"
+PROMPT = "U area  good coding assiten to debug the cde and write a python hello world code for me"
+GENERATE_KWARGS = dict(max_length=100, num_return_sequences=1)
 
-#baka coder using gpt 2 
-prompt = "U area  good coding assiten to debug the cde and write a python hello world code for me"
-code = generation(prompt, max_length=100, num_return_sequences=1)
 
-print(code[0]["generated_text"])
\ No newline at end of file
+def main():
+    # Initialize the text generation pipeline with the GPT-2 model
+    generation = get_pipeline(TASK, MODEL)
+
+    #baka coder using gpt 2 
+    code = generation(PROMPT, **GENERATE_KWARGS)
+
+    print(code[0]["generated_text"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,9 @@
-from transformers import pipeline
+from model_registry import get_pipeline
 
-generator = pipeline("text-generation", model="distilgpt2")
-
-prompt = "Write a short poem about the moon on a wedding night."
-
-poem = generator(
-    prompt,
+# settings, also read by benchmarks/generation.py
+TASK, MODEL = "text-generation", "distilgpt2"
+PROMPT = "Write a short poem about the moon on a wedding night."
+GENERATE_KWARGS = dict(
     max_new_tokens=100,
     do_sample=True,
     temperature=0.9,   # more creativity
@@ -13,4 +11,14 @@ poem = generator(
     top_p=0.95         # nucleus sampling
 )
 
-print(poem[0]["generated_text"])
+
+def main():
+    generator = get_pipeline(TASK, MODEL)
+
+    poem = generator(PROMPT, **GENERATE_KWARGS)
+
+    print(poem[0]["generated_text"])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
-from transformers import pipeline
+from model_registry import get_pipeline
 
-genreratotr = pipeline ("text-generation", model="distilgpt2")
+# settings, also read by benchmarks/generation.py
+TASK, MODEL = "text-generation", "distilgpt2"
+PROMPT = "once a upon a time in a toy box there was a,"
+GENERATE_KWARGS = dict(max_new_tokens=50, do_sample=True, pad_token_id=50256, truncation=True)
 
-# Using pre-trained transformers
-prompt = "once a upon a time in a toy box there was a,"
-story = genreratotr(prompt, max_new_tokens=50, do_sample=True, pad_token_id=50256, truncation=True)
 
-# Generate a Toy Story
-print(story[0]["generated_text"])
+def main():
+    genreratotr = get_pipeline(TASK, MODEL)
+
+    # Using pre-trained transformers
+    story = genreratotr(PROMPT, **GENERATE_KWARGS)
+
+    # Generate a Toy Story
+    print(story[0]["generated_text"])
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,33 @@
 # This is like getting your chef's tools ready.
 #!pip install transformers//only use when in colab or jupyter notebook
 
-# Step 2: Import the 'pipeline' tool
-# The pipeline is like an expert assistant that handles the complicated steps.
-from transformers import pipeline
+# Step 2: Import the shared model registry
+# The registry hands out one 'pipeline' per model, so the chef is only hired once.
+from model_registry import get_pipeline
 
-# Step 3: Hire your junior chef
-# We're loading a pre-trained model (a smaller version of GPT-2).
-# This chef already read a lot of books and is ready for your instructions!
-text_generator = pipeline("text-generation", model="gpt2")
+# settings, also read by benchmarks/generation.py
+TASK, MODEL = "text-generation", "gpt2"
+PROMPT = "In a world where robots can dream, they often dream of"
+GENERATE_KWARGS = dict(max_length=25, num_return_sequences=1)
 
-# Step 4: Give your instruction (the "prompt")
-# This is the beginning of the recipe you want the chef to finish.
-prompt = "In a world where robots can dream, they often dream of"
 
-# Step 5: Let the chef create!
-# The AI will now use its 'attention' power to predict what comes next.
-generated_text = text_generator(prompt, max_length=25, num_return_sequences=1)
+def main():
+    # Step 3: Hire your junior chef
+    # We're loading a pre-trained model (a smaller version of GPT-2).
+    # This chef already read a lot of books and is ready for your instructions!
+    text_generator = get_pipeline(TASK, MODEL)
 
-# Step 6: See the result
-print(generated_text[0]['generated_text'])
\ No newline at end of file
+    # Step 4: Give your instruction (the "prompt")
+    # This is the beginning of the recipe you want the chef to finish.
+    prompt = PROMPT
+
+    # Step 5: Let the chef create!
+    # The AI will now use its 'attention' power to predict what comes next.
+    generated_text = text_generator(prompt, **GENERATE_KWARGS)
+
+    # Step 6: See the result
+    print(generated_text[0]['generated_text'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Process-wide registry of Hugging Face pipelines for the baka scripts.
+
+    from model_registry import get_pipeline
+    generator = get_pipeline("text-generation", "distilgpt2")
+
+A pipeline is built the first time a (task, model) pair is asked for and the
+same instance is handed to every later caller, so gpt2 / distilgpt2 are
+loaded once per process no matter how many scripts use them.
+
+Loaded pipelines are kept in least-recently-used order. When the weights of
+all loaded pipelines go over the memory budget (`BAKA_MODEL_BUDGET_MB`,
+default 2048, or `set_budget_mb()`), the least recently used ones are
+dropped. A pipeline bigger than the whole budget is still loaded - it just
+ends up alone in the registry.
+"""
+
+import gc
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_BUDGET_MB = float(os.environ.get("BAKA_MODEL_BUDGET_MB", 2048))
+
+_lock = threading.Lock()
+_loading = {}             # key -> Lock, so two threads never load the same model twice
+_pipelines = OrderedDict()  # key -> (pipeline, size in bytes), oldest first
+_budget_bytes = DEFAULT_BUDGET_MB * 2**20
+
+
+def set_budget_mb(mb):
+    """Changes the memory budget and evicts right away if it is now exceeded."""
+    global _budget_bytes
+    with _lock:
+        _budget_bytes = mb * 2**20
+        _evict(keep=None)
+
+
+def pipeline_size(pipe):
+    """Bytes held by the pipeline's model parameters and buffers."""
+    model = pipe.model
+    tensors = list(model.parameters()) + list(model.buffers())
+    seen, total = set(), 0
+    for t in tensors:
+        ptr = t.data_ptr()
+        if ptr not in seen:  # tied weights count once
+            seen.add(ptr)
+            total += t.numel() * t.element_size()
+    return total
+
+
+def _evict(keep):
+    used = sum(size for _, size in _pipelines.values())
+    for key in list(_pipelines):
+        if used <= _budget_bytes:
+            break
+        if key == keep:
+            continue
+        _, size = _pipelines.pop(key)
+        used -= size
+        print(f"🧹 Evicted {key[1]} ({key[0]}) from the model registry")
+    gc.collect()
+
+
+def get_pipeline(task, model, **kwargs):
+    """Returns the shared pipeline for (task, model), loading it on first use."""
+    key = (task, model, tuple(sorted(kwargs.items())))
+    with _lock:
+        if key in _pipelines:
+            _pipelines.move_to_end(key)
+            return _pipelines[key][0]
+        load_lock = _loading.setdefault(key, threading.Lock())
+
+    with load_lock:
+        with _lock:
+            # another thread may have finished loading while we waited
+            if key in _pipelines:
+                _pipelines.move_to_end(key)
+                return _pipelines[key][0]
+
+        from transformers import pipeline
+        pipe = pipeline(task, model=model, **kwargs)
+
+        with _lock:
+            _pipelines[key] = (pipe, pipeline_size(pipe))
+            _loading.pop(key, None)
+            _evict(keep=key)
+        return pipe
+
+
+def loaded():
+    """[(task, model, size_mb)] of the loaded pipelines, least recently used first."""
+    with _lock:
+        return [(k[0], k[1], round(size / 2**20, 1)) for k, (_, size) in _pipelines.items()]
+
+
+def clear():
+    with _lock:
+        _pipelines.clear()
+        gc.collect()
@@ -0,0 +1,21 @@
+"""
+Runs every baka generation script in one process.
+
+The scripts share pipelines through `model_registry`, so gpt2, distilgpt2 and
+the translation model are each loaded once here instead of once per script.
+"""
+
+import importlib
+
+from model_registry import loaded
+
+SCRIPTS = ["main", "main2", "main3", "main4", "main5", "main6", "en_de"]
+
+if __name__ == "__main__":
+    for name in SCRIPTS:
+        print(f"\n=== {name}.py ===")
+        importlib.import_module(name).main()
+
+    print("\n📦 Loaded models:")
+    for task, model, size_mb in loaded():
+        print(f"  {model} ({task}) - {size_mb} MB")
@@ -1,15 +1,27 @@
-from transformers import pipeline, AutoTokenizer, GPT2LMHeadModel
+from transformers import AutoTokenizer, GPT2LMHeadModel
 
-model = GPT2LMHeadModel.from_pretrained("tiny-gpt")
-tokenizer = AutoTokenizer.from_pretrained("tiny-gpt")
+from chat_engine import ChatEngine
 
-generator = pipeline("text-generation", model=model, tokenizer=tokenizer)
+# settings, also read by benchmarks/generation.py
+MODEL_DIR = "tiny-gpt"
+MAX_NEW_TOKENS = 50
 
-print("🧠 TinyGPT Chatbot — type 'exit' to quit\n")
+if __name__ == "__main__":
+    model = GPT2LMHeadModel.from_pretrained(MODEL_DIR)
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
 
-while True:
-    prompt = input("You: ")
-    if prompt.strip().lower() == "exit":
-        break
-    output = generator(prompt, max_new_tokens=50)[0]["generated_text"]
-    print("Bot:", output)
+    # Keeps the conversation's KV cache between turns and streams the reply
+    engine = ChatEngine(model, tokenizer, max_new_tokens=MAX_NEW_TOKENS)
+
+    print("🧠 TinyGPT Chatbot — type 'exit' to quit ('reset' clears the conversation)\n")
+
+    while True:
+        prompt = input("You: ")
+        if prompt.strip().lower() == "exit":
+            break
+        if prompt.strip().lower() == "reset":
+            engine.reset()
+            continue
+        print("Bot: ", end="", flush=True)
+        engine.respond(prompt)
+        print()
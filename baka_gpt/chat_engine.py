@@ -0,0 +1,109 @@
+"""
+KV-cached, streaming chat engine for tiny-gpt.
+
+The engine keeps the `past_key_values` of the whole conversation between
+turns, so each turn only runs the model over the new user tokens and then one
+token at a time while generating. Tokens are streamed to a callback (stdout by
+default) as soon as they are sampled.
+
+tiny-gpt only has 128 positions and GPT-2 uses absolute position embeddings,
+so the cache cannot simply be shifted left. When a turn would not fit, the
+oldest whole turns are evicted and the remaining window is prefilled once;
+every other turn reuses the cache untouched.
+"""
+
+import sys
+
+import torch
+
+
+def print_token(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+class ChatEngine:
+    def __init__(self, model, tokenizer, max_new_tokens=50, do_sample=False,
+                 temperature=1.0, top_k=0, separator="\n"):
+        self.model = model.eval()
+        self.tokenizer = tokenizer
+        self.max_positions = model.config.n_positions
+        self.max_new_tokens = max_new_tokens
+        self.do_sample = do_sample
+        self.temperature = temperature
+        self.top_k = top_k
+        self.separator = separator
+        self.reset()
+
+    def reset(self):
+        """Forgets the conversation and its cache."""
+        self.past = None
+        self.ids = []     # tokens currently held in the cache
+        self.turns = []   # length of every turn in `ids`, oldest first
+
+    # -- cache management -----------------------------------------------------
+
+    def _forward(self, ids):
+        """Runs `ids` on top of the cache and returns the last logits."""
+        input_ids = torch.tensor([ids], dtype=torch.long, device=self.model.device)
+        out = self.model(input_ids=input_ids, past_key_values=self.past, use_cache=True)
+        self.past = out.past_key_values
+        self.ids.extend(ids)
+        return out.logits[0, -1]
+
+    def _make_room(self, needed):
+        """Evicts oldest turns until `needed` more positions fit, re-prefilling once."""
+        if len(self.ids) + needed <= self.max_positions:
+            return
+        dropped = 0
+        while self.turns and len(self.ids) - dropped + needed > self.max_positions:
+            dropped += self.turns.pop(0)
+        kept = self.ids[dropped:]
+        self.past, self.ids = None, []
+        if kept:
+            self._forward(kept)
+
+    # -- generation -----------------------------------------------------------
+
+    def _next_token(self, logits):
+        if not self.do_sample:
+            return int(torch.argmax(logits))
+        logits = logits / max(self.temperature, 1e-5)
+        if self.top_k:
+            kth = torch.topk(logits, self.top_k).values[-1]
+            logits = logits.masked_fill(logits < kth, float("-inf"))
+        return int(torch.multinomial(torch.softmax(logits, dim=-1), 1))
+
+    @torch.inference_mode()
+    def respond(self, text, on_token=print_token):
+        """
+        Adds a user turn, streams the reply through `on_token` and returns the
+        full reply text.
+        """
+        prefix = self.separator if self.ids else ""
+        prompt_ids = self.tokenizer.encode(prefix + text + self.separator)
+        # keep the newest part of a prompt that could never fit on its own
+        prompt_ids = prompt_ids[-(self.max_positions - 1):]
+        budget = min(self.max_new_tokens, self.max_positions - len(prompt_ids))
+        self._make_room(len(prompt_ids) + budget)
+
+        start = len(self.ids)
+        logits = self._forward(prompt_ids)
+        reply_ids = []
+        printed = ""
+        for _ in range(budget):
+            token = self._next_token(logits)
+            if token == self.tokenizer.eos_token_id:
+                break
+            reply_ids.append(token)
+            # decode the whole reply so multi-token characters come out whole
+            text_so_far = self.tokenizer.decode(reply_ids)
+            if not text_so_far.endswith("�"):
+                on_token(text_so_far[len(printed):])
+                printed = text_so_far
+            # the token goes into the cache even when it is the last one, so
+            # the next turn continues from the complete reply
+            logits = self._forward([token])
+
+        self.turns.append(len(self.ids) - start)
+        return self.tokenizer.decode(reply_ids)
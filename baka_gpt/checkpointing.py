@@ -0,0 +1,152 @@
+"""
+Asynchronous checkpointing for tiny-gpt training.
+
+`AsyncCheckpointCallback` replaces `save_strategy="epoch"`. At the end of an
+epoch it snapshots the model/optimizer/scheduler/RNG state into CPU memory
+(fast) and hands the snapshot to a background thread that writes it (slow),
+so the training loop keeps running while the files hit disk.
+
+Each checkpoint directory uses the same file names as the HF Trainer, so
+`trainer.train(resume_from_checkpoint=...)` keeps working:
+  model.safetensors   - weights, tied tensors stored once, mmap-loadable
+  optimizer.pt, scheduler.pt, rng_state.pth, trainer_state.json, config.json
+
+training_args.bin is written once to the output directory instead of being
+copied into every checkpoint. Of the checkpoints written by this run, only
+the last `keep_last` (at least the latest one) plus the one with the lowest
+loss are kept on disk; checkpoints left in `output_dir` by earlier runs are
+never touched. The loss is the last logged training loss, or the eval loss
+when a short run logged none; with neither, only the latest ones are kept.
+"""
+
+import copy
+import os
+import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+from safetensors.torch import save_file
+from transformers import TrainerCallback
+
+
+def snapshot_state_dict(model):
+    """
+    CPU copy of the model weights. Tensors that share storage (GPT-2 ties
+    lm_head to the token embedding) are copied and stored only once.
+    """
+    seen = {}
+    snapshot = {}
+    for name, tensor in model.state_dict().items():
+        key = (tensor.untyped_storage().data_ptr(), tensor.storage_offset(), tuple(tensor.shape))
+        if key in seen:
+            continue
+        seen[key] = name
+        snapshot[name] = tensor.detach().to("cpu", copy=True).contiguous()
+    return snapshot
+
+
+def rng_snapshot():
+    state = {
+        "python": random.getstate(),
+        "numpy": np.random.get_state(),
+        "cpu": torch.random.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.random.get_rng_state_all()
+    return state
+
+
+class AsyncCheckpointCallback(TrainerCallback):
+    """Writes epoch checkpoints from a background thread and prunes old ones."""
+
+    def __init__(self, output_dir, keep_last=2, training_args=None):
+        self.output_dir = output_dir
+        self.keep_last = max(1, keep_last)
+        self.training_args = training_args
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint")
+        self.pending = None
+        self.last_loss = None
+        self.last_eval_loss = None
+        self.best = None  # (loss, path)
+        self.written = []  # checkpoint paths of this run, oldest first
+
+    # -- Trainer hooks --------------------------------------------------------
+
+    def on_train_begin(self, args, state, control, **kwargs):
+        if state.is_world_process_zero:
+            os.makedirs(self.output_dir, exist_ok=True)
+            torch.save(self.training_args or args, os.path.join(self.output_dir, "training_args.bin"))
+
+    def on_log(self, args, state, control, logs=None, **kwargs):
+        if logs and "loss" in logs:
+            self.last_loss = logs["loss"]
+
+    def on_evaluate(self, args, state, control, metrics=None, **kwargs):
+        # short runs may end an epoch before the first `logging_steps`
+        if metrics and "eval_loss" in metrics:
+            self.last_eval_loss = metrics["eval_loss"]
+
+    def on_epoch_end(self, args, state, control, model=None, optimizer=None, lr_scheduler=None, **kwargs):
+        if not state.is_world_process_zero:
+            return
+        # at most one checkpoint in flight, so snapshots never pile up in RAM
+        self.wait()
+        snapshot = {
+            "model": snapshot_state_dict(model),
+            "config": model.config.to_json_string(),
+            "optimizer": copy.deepcopy(optimizer.state_dict()) if optimizer else None,
+            "scheduler": copy.deepcopy(lr_scheduler.state_dict()) if lr_scheduler else None,
+            "rng": rng_snapshot(),
+            "state": copy.deepcopy(state),
+            "loss": self.last_loss if self.last_loss is not None else self.last_eval_loss,
+        }
+        self.pending = self.executor.submit(self._write, state.global_step, snapshot)
+
+    def on_train_end(self, args, state, control, **kwargs):
+        self.wait()
+        self.executor.shutdown(wait=True)
+
+    # -- background work ------------------------------------------------------
+
+    def wait(self):
+        if self.pending is not None:
+            self.pending.result()  # re-raises a failed write in the training thread
+            self.pending = None
+
+    def _write(self, step, snapshot):
+        final = os.path.join(self.output_dir, f"checkpoint-{step}")
+        tmp = final + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        save_file(snapshot["model"], os.path.join(tmp, "model.safetensors"), metadata={"format": "pt"})
+        with open(os.path.join(tmp, "config.json"), "w") as f:
+            f.write(snapshot["config"])
+        if snapshot["optimizer"] is not None:
+            torch.save(snapshot["optimizer"], os.path.join(tmp, "optimizer.pt"))
+        if snapshot["scheduler"] is not None:
+            torch.save(snapshot["scheduler"], os.path.join(tmp, "scheduler.pt"))
+        torch.save(snapshot["rng"], os.path.join(tmp, "rng_state.pth"))
+        snapshot["state"].save_to_json(os.path.join(tmp, "trainer_state.json"))
+
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(tmp, final)
+
+        if final in self.written:
+            self.written.remove(final)
+        self.written.append(final)
+        loss = snapshot["loss"]
+        if loss is not None and (self.best is None or loss < self.best[0]):
+            self.best = (loss, final)
+        self._prune()
+
+    def _prune(self):
+        # only this run's checkpoints, in the order they were written
+        keep = set(self.written[-self.keep_last:])
+        if self.best is not None:
+            keep.add(self.best[1])
+        for path in [p for p in self.written if p not in keep]:
+            shutil.rmtree(path, ignore_errors=True)
+            self.written.remove(path)
@@ -1,12 +1,29 @@
+import argparse
+
 from transformers import pipeline, AutoTokenizer, GPT2LMHeadModel
 
-# Load trained model and tokenizer
-model = GPT2LMHeadModel.from_pretrained("tiny-gpt")
-tokenizer = AutoTokenizer.from_pretrained("tiny-gpt")
+from optimized import VARIANTS, greedy_generate, load_model
+
+# settings, also read by benchmarks/generation.py
+MODEL_DIR = "tiny-gpt"
+PROMPT = "The moon"
+MAX_NEW_TOKENS = 50
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate text with tiny-gpt")
+    parser.add_argument("--variant", choices=VARIANTS, default="fp32",
+                        help="fp32 uses the HF pipeline, the rest use optimized.py")
+    args = parser.parse_args()
 
-generator = pipeline("text-generation", model=model, tokenizer=tokenizer)
+    # Load trained model and tokenizer
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
 
-prompt = "The moon"
-output = generator(prompt, max_new_tokens=50)[0]["generated_text"]
+    if args.variant == "fp32":
+        model = GPT2LMHeadModel.from_pretrained(MODEL_DIR)
+        generator = pipeline("text-generation", model=model, tokenizer=tokenizer)
+        output = generator(PROMPT, max_new_tokens=MAX_NEW_TOKENS)[0]["generated_text"]
+    else:
+        model = load_model(args.variant, MODEL_DIR)
+        output = greedy_generate(model, tokenizer, PROMPT, max_new_tokens=MAX_NEW_TOKENS)
 
-print("✨ Generated Text:\n", output)
+    print("✨ Generated Text:\n", output)
@@ -0,0 +1,148 @@
+"""
+Flat, memory-mapped token files for corpora that do not fit in RAM.
+
+Pre-tokenize once:
+    python memmap_data.py data/my_poems.txt --out data/poems
+
+That streams the text files line by line and writes
+  data/poems.bin       - every token as uint16 (GPT-2's 50257 ids fit)
+  data/poems.json      - dtype / token count / tokenizer name / source files
+
+Training then reads the .bin through `np.memmap` with `MemmapBlockDataset`,
+so startup does not depend on corpus size and DataLoader workers share the
+same page cache instead of each holding a copy. `EpochCallback` moves the
+dataset to the Trainer's current epoch, so every epoch draws new windows.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+from transformers import TrainerCallback
+
+TOKEN_DTYPE = np.uint16
+
+
+def tokenize_to_file(lines, tokenizer, out, batch_lines):
+    """Tokenizes `lines` in batches, appends them to `out`, returns #tokens written."""
+    written = 0
+    batch = []
+
+    def flush():
+        nonlocal written
+        ids = tokenizer([line + tokenizer.eos_token for line in batch])["input_ids"]
+        flat = np.fromiter((t for seq in ids for t in seq), dtype=TOKEN_DTYPE)
+        flat.tofile(out)
+        written += len(flat)
+        batch.clear()
+
+    for line in lines:
+        batch.append(line.rstrip("\n"))
+        if len(batch) >= batch_lines:
+            flush()
+    if batch:
+        flush()
+    return written
+
+
+def pretokenize(paths, tokenizer, out_prefix, batch_lines=1000):
+    """
+    Tokenizes every file in `paths` into `<out_prefix>.bin` and writes the
+    metadata next to it. Memory use is bounded by `batch_lines`, not by the
+    corpus size.
+    """
+    if len(tokenizer) > np.iinfo(TOKEN_DTYPE).max + 1:
+        raise ValueError(f"vocab of {len(tokenizer)} does not fit in {np.dtype(TOKEN_DTYPE).name}")
+
+    total = 0
+    with open(out_prefix + ".bin", "wb") as out:
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                total += tokenize_to_file(f, tokenizer, out, batch_lines)
+
+    with open(out_prefix + ".json", "w") as f:
+        json.dump({
+            "dtype": np.dtype(TOKEN_DTYPE).name,
+            "num_tokens": total,
+            "tokenizer": tokenizer.name_or_path,
+            "files": [os.path.abspath(p) for p in paths],
+        }, f, indent=2)
+    return total
+
+
+class MemmapBlockDataset(Dataset):
+    """
+    Samples random `block_size` windows from a pre-tokenized .bin file.
+
+    The memmap is opened lazily so it is created inside each DataLoader worker
+    after the fork. Item `i` maps to a deterministic random offset (seeded by
+    `seed` and `i`), so runs are reproducible; `set_epoch` (called by
+    `EpochCallback`) draws fresh offsets every epoch. Workers get a fresh copy
+    of the dataset each epoch unless `dataloader_persistent_workers` is set.
+    """
+
+    def __init__(self, prefix, block_size, num_samples=None, seed=0):
+        with open(prefix + ".json") as f:
+            meta = json.load(f)
+        self.path = prefix + ".bin"
+        self.dtype = np.dtype(meta["dtype"])
+        self.num_tokens = meta["num_tokens"]
+        self.block_size = block_size
+        self.seed = seed
+        self.epoch = 0
+        if self.num_tokens <= block_size:
+            raise ValueError(f"{self.path} has {self.num_tokens} tokens, need more than {block_size}")
+        self.num_samples = num_samples or self.num_tokens // block_size
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(self.num_tokens,))
+        return self._data
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def __len__(self):
+        return self.num_samples
+
+    def __getitem__(self, i):
+        rng = np.random.default_rng((self.seed, self.epoch, i))
+        start = int(rng.integers(0, self.num_tokens - self.block_size + 1))
+        block = torch.from_numpy(self.data[start:start + self.block_size].astype(np.int64))
+        return {"input_ids": block, "labels": block.clone()}
+
+    def __getstate__(self):
+        # never pickle an open memmap into worker processes
+        state = self.__dict__.copy()
+        state["_data"] = None
+        return state
+
+
+class EpochCallback(TrainerCallback):
+    """Calls `dataset.set_epoch` at the start of every training epoch."""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+
+    def on_epoch_begin(self, args, state, control, **kwargs):
+        self.dataset.set_epoch(int(round(state.epoch or 0)))
+
+
+if __name__ == "__main__":
+    from transformers import AutoTokenizer
+
+    parser = argparse.ArgumentParser(description="Pre-tokenize text files into a uint16 memmap")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--out", required=True, help="output prefix, e.g. data/poems")
+    parser.add_argument("--tokenizer", default="distilgpt2")
+    parser.add_argument("--batch-lines", type=int, default=1000)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    n = pretokenize(args.files, tokenizer, args.out, args.batch_lines)
+    print(f"✅ Wrote {n} tokens to {args.out}.bin")
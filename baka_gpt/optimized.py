@@ -0,0 +1,276 @@
+"""
+Optimized CPU inference variants of tiny-gpt.
+
+    python optimized.py --bench            # latency / size of every variant
+    python optimized.py --check            # logits parity against fp32
+
+Variants (all returned as `input_ids -> logits` callables):
+  fp32      - the plain HF model
+  int8      - dynamic int8 quantization of the transformer blocks' linear
+              layers (lm_head stays tied to the fp32 token embedding)
+  traced    - TorchScript trace of the fp32 model
+  int8-traced - TorchScript trace of the int8 model
+  compiled  - torch.compile (inductor)
+
+GPT-2 implements its projections with `Conv1D`, which dynamic quantization
+does not know about, so those modules are swapped for equivalent
+`nn.Linear` layers first. Only `transformer.h` is quantized: quantizing
+`lm_head` would untie it from `wte` and keep an int8 copy of the head next
+to the fp32 embedding, which is bigger, not smaller. The quantized weights
+are saved under `.optimized/` too and loaded into a quantized skeleton on the
+next run instead of being converted again. A TorchScript trace is only valid for the sequence
+length it was traced with (GPT-2's positions and causal mask become
+constants), so traced variants keep one trace per length bucket (16, 32, 64,
+... up to n_positions): inputs are right-padded to their bucket and the
+padded positions are cut off again, which causal attention makes exact.
+Each bucket is traced on first use, saved under `.optimized/` keyed on the
+weights hash and torch version, and loaded straight from disk on the next
+run; `compiled` points inductor's FX graph cache at the
+same directory, which is the only on-disk cache torch.compile has.
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import resource
+import time
+
+import torch
+from transformers import AutoTokenizer, GPT2Config, GPT2LMHeadModel
+from transformers.pytorch_utils import Conv1D
+
+VARIANTS = ["fp32", "int8", "traced", "int8-traced", "compiled"]
+DEFAULT_CACHE_DIR = ".optimized"
+
+
+class LogitsOnly(torch.nn.Module):
+    """Wraps the HF model so it takes input_ids and returns plain logits (traceable)."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids):
+        return self.model(input_ids=input_ids, use_cache=False, return_dict=False)[0]
+
+
+def conv1d_to_linear(module):
+    """Replaces every GPT-2 `Conv1D` with the equivalent `nn.Linear`, in place."""
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            nx, nf = child.weight.shape
+            linear = torch.nn.Linear(nx, nf)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            conv1d_to_linear(child)
+    return module
+
+
+def quantize_int8(model):
+    """Quantizes the transformer blocks in place; lm_head stays tied to wte."""
+    blocks = conv1d_to_linear(model.transformer.h)
+    model.transformer.h = torch.ao.quantization.quantize_dynamic(blocks, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def weights_digest(model_dir):
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(model_dir)):
+        if name.endswith((".safetensors", ".bin", "config.json")):
+            with open(os.path.join(model_dir, name), "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+class BucketedTrace:
+    """`input_ids -> logits` over one TorchScript trace per padded length bucket."""
+
+    def __init__(self, build, path_prefix, max_positions, min_bucket=16):
+        self.build = build  # () -> eager LogitsOnly module, only called to trace a missing bucket
+        self.path_prefix = path_prefix
+        self.max_positions = max_positions
+        self.min_bucket = min_bucket
+        self.traces = {}
+        self._eager = None
+
+    def bucket(self, length):
+        size = self.min_bucket
+        while size < length:
+            size *= 2
+        return min(size, self.max_positions)
+
+    def trace(self, size):
+        if size not in self.traces:
+            path = f"{self.path_prefix}-len{size}.pt"
+            if os.path.exists(path):
+                self.traces[size] = torch.jit.load(path).eval()
+            else:
+                if self._eager is None:
+                    self._eager = self.build()
+                example = torch.randint(0, 1000, (1, size))
+                with torch.inference_mode():
+                    traced = torch.jit.freeze(torch.jit.trace(self._eager, example))
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                torch.jit.save(traced, path)
+                self.traces[size] = traced
+        return self.traces[size]
+
+    def __call__(self, input_ids):
+        length = input_ids.shape[1]
+        if length > self.max_positions:
+            raise ValueError(f"{length} tokens, the model has {self.max_positions} positions")
+        size = self.bucket(length)
+        padded = torch.nn.functional.pad(input_ids, (0, size - length))
+        # causal attention: the padding after the real tokens does not change their logits
+        return self.trace(size)(padded)[:, :length]
+
+    def eval(self):
+        return self
+
+
+def _cache_key(variant, model_dir):
+    return f"{variant}-{weights_digest(model_dir)}-torch{torch.__version__}"
+
+
+def _load_int8(model_dir, cache_dir, torchscript):
+    """The int8 model, quantized once and then loaded from `cache_dir`."""
+    path = os.path.join(cache_dir, _cache_key("int8", model_dir) + ".pt")
+    if os.path.exists(path):
+        # quantized skeleton (random init is cheap for tiny-gpt), then the saved int8 weights
+        config = GPT2Config.from_pretrained(model_dir, torchscript=torchscript)
+        model = quantize_int8(GPT2LMHeadModel(config).eval())
+        model.load_state_dict(torch.load(path, weights_only=False))
+        return model.eval()
+    model = quantize_int8(GPT2LMHeadModel.from_pretrained(model_dir, torchscript=torchscript).eval())
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    torch.save(model.state_dict(), tmp)
+    os.replace(tmp, path)
+    return model
+
+
+def _build(variant, model_dir, cache_dir=DEFAULT_CACHE_DIR):
+    torchscript = variant.endswith("traced")
+    if variant.startswith("int8"):
+        model = _load_int8(model_dir, cache_dir, torchscript)
+    else:
+        model = GPT2LMHeadModel.from_pretrained(model_dir, torchscript=torchscript).eval()
+    return LogitsOnly(model).eval()
+
+
+def load_model(variant="fp32", model_dir="tiny-gpt", cache_dir=DEFAULT_CACHE_DIR):
+    """Returns an eval-mode `input_ids -> logits` callable for `variant`."""
+    if variant not in VARIANTS:
+        raise ValueError(f"unknown variant {variant!r}, expected one of {VARIANTS}")
+
+    if variant.endswith("traced"):
+        prefix = os.path.join(cache_dir, _cache_key(variant, model_dir))
+        max_positions = GPT2Config.from_pretrained(model_dir).n_positions
+        return BucketedTrace(lambda: _build(variant, model_dir, cache_dir), prefix, max_positions)
+
+    wrapped = _build(variant, model_dir, cache_dir)
+    if variant == "compiled":
+        os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.abspath(os.path.join(cache_dir, "inductor")))
+        return torch.compile(wrapped, dynamic=True)
+    return wrapped
+
+
+@torch.inference_mode()
+def greedy_generate(model, tokenizer, prompt, max_new_tokens=50, max_positions=128):
+    """Greedy decoding with any `input_ids -> logits` variant (no KV cache)."""
+    ids = tokenizer.encode(prompt)
+    for _ in range(max_new_tokens):
+        logits = model(torch.tensor([ids[-max_positions:]]))
+        token = int(torch.argmax(logits[0, -1]))
+        if token == tokenizer.eos_token_id:
+            break
+        ids.append(token)
+    return tokenizer.decode(ids)
+
+
+@torch.inference_mode()
+def parity_check(model, reference, tokenizer, prompts, atol=0.5):
+    """
+    Compares a variant's logits against fp32. Returns the largest absolute
+    difference and the fraction of positions whose argmax token agrees.
+    """
+    max_diff, agree, total = 0.0, 0, 0
+    for prompt in prompts:
+        ids = torch.tensor([tokenizer.encode(prompt)])
+        ref = reference(ids).float()
+        out = model(ids).float()
+        max_diff = max(max_diff, (ref - out).abs().max().item())
+        agree += (ref.argmax(-1) == out.argmax(-1)).sum().item()
+        total += ids.shape[1]
+    return {"max_abs_diff": max_diff, "top1_agreement": agree / total, "ok": max_diff <= atol}
+
+
+def serialized_mb(model):
+    """Size of what the variant would store on disk: its trace, or its state_dict."""
+    if isinstance(model, BucketedTrace):
+        model = next(iter(model.traces.values()))  # every bucket holds the same weights
+    model = getattr(model, "_orig_mod", model)  # torch.compile wrapper
+    buffer = io.BytesIO()
+    if isinstance(model, torch.jit.ScriptModule):
+        torch.jit.save(model, buffer)  # frozen traces keep their weights as constants
+    else:
+        torch.save(model.state_dict(), buffer)  # quantized packed params included, tied tensors once
+    return buffer.tell() / 2**20
+
+
+def _rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@torch.inference_mode()
+def benchmark(variant, model_dir, cache_dir, seq_len=64, steps=50):
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    model = load_model(variant, model_dir, cache_dir)
+    x = torch.randint(0, 50257, (1, seq_len))
+    model(x)  # warm-up (and compilation for torch.compile)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        model(x)
+    per_call_ms = (time.perf_counter() - start) / steps * 1000
+
+    return {
+        "variant": variant,
+        "load_s": round(load_s, 3),
+        "ms_per_forward": round(per_call_ms, 3),
+        "serialized_mb": round(serialized_mb(model), 2),
+        "peak_rss_growth_mb": round(_rss_mb() - rss_before, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build, check and benchmark optimized tiny-gpt variants")
+    parser.add_argument("--model", default="tiny-gpt")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--variants", nargs="+", default=VARIANTS, choices=VARIANTS)
+    parser.add_argument("--check", action="store_true", help="compare logits against fp32")
+    parser.add_argument("--bench", action="store_true", help="report latency and memory")
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    if args.check:
+        reference = load_model("fp32", args.model)
+        # lengths in different trace buckets
+        prompts = ["The moon", "Stars whisper secrets just to me,", "In twilight's arms, the world stands still",
+                   " ".join(["The river hums a song of silver light beneath the sleeping hills,"] * 4)]
+        for variant in args.variants:
+            result = parity_check(load_model(variant, args.model, args.cache_dir), reference, tokenizer, prompts)
+            print(f"{variant:12s} max|Δ|={result['max_abs_diff']:.4f} "
+                  f"top1={result['top1_agreement']:.1%} {'✅' if result['ok'] else '❌'}")
+    if args.bench:
+        # peak RSS never shrinks, so for clean memory numbers bench one variant per process
+        for variant in args.variants:
+            print(benchmark(variant, args.model, args.cache_dir))
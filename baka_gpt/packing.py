@@ -0,0 +1,114 @@
+"""
+Helpers that keep padding out of the tiny-gpt training batches.
+
+Two ways to feed the model:
+  * pack   - concatenate every line (EOS separated) and cut the stream into
+             full blocks; only the last, partial block of each map batch is
+             padded (pads masked to -100), so no text is dropped
+  * bucket - keep one line per example, group similar lengths together and pad
+             each batch only up to its own longest line (pads masked to -100)
+"""
+
+from itertools import chain
+
+import torch
+
+
+def tokenize_lines(tokenizer, add_eos=True):
+    """Returns a `datasets.map` function that tokenizes lines without padding."""
+    def tokenize(examples):
+        texts = examples["text"]
+        if add_eos:
+            texts = [t + tokenizer.eos_token for t in texts]
+        return tokenizer(texts)
+    return tokenize
+
+
+def group_into_blocks(block_size, pad_token_id=None):
+    """
+    Returns a batched `datasets.map` function that concatenates the tokenized
+    lines and splits them into `block_size` chunks. The tail that does not fill
+    a whole block is padded with `pad_token_id` (attention 0, label -100), or
+    dropped like in the HF run_clm example when no pad id is given.
+    """
+    def group(examples):
+        concatenated = {k: list(chain.from_iterable(examples[k])) for k in examples.keys()}
+        total_length = len(concatenated["input_ids"])
+        tail = total_length % block_size
+        if tail and pad_token_id is not None:
+            pad = block_size - tail
+            concatenated["input_ids"] += [pad_token_id] * pad
+            concatenated["attention_mask"] += [0] * pad
+            total_length += pad
+        total_length = (total_length // block_size) * block_size
+        result = {
+            k: [t[i:i + block_size] for i in range(0, total_length, block_size)]
+            for k, t in concatenated.items()
+        }
+        result["labels"] = [
+            [t if m else -100 for t, m in zip(ids, mask)]
+            for ids, mask in zip(result["input_ids"], result["attention_mask"])
+        ]
+        return result
+    return group
+
+
+def pack_dataset(dataset, tokenizer, block_size, map_batch_size=1000):
+    """Tokenizes a `text` dataset and packs it into `block_size` blocks (tails padded)."""
+    columns = dataset.column_names
+    tokenized = dataset.map(tokenize_lines(tokenizer), batched=True, remove_columns=columns)
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    packed = tokenized.map(group_into_blocks(block_size, pad_token_id), batched=True,
+                           batch_size=map_batch_size)
+    if packed.num_rows == 1 and sum(packed[0]["attention_mask"]) < block_size:
+        print(f"⚠️  Corpus is shorter than one {block_size}-token block; training on a single padded block")
+    return packed
+
+
+def bucket_dataset(dataset, tokenizer, max_length):
+    """
+    Tokenizes one line per example (truncated to `max_length`, no padding).
+    Adds a `length` column so `TrainingArguments(group_by_length=True)` can
+    bucket similar lengths without re-measuring every example.
+    """
+    columns = dataset.column_names
+    tokenize = tokenize_lines(tokenizer)
+
+    def tokenize_truncated(examples):
+        tokens = tokenize(examples)
+        tokens["input_ids"] = [ids[:max_length] for ids in tokens["input_ids"]]
+        tokens["attention_mask"] = [m[:max_length] for m in tokens["attention_mask"]]
+        tokens["length"] = [len(ids) for ids in tokens["input_ids"]]
+        return tokens
+
+    return dataset.map(tokenize_truncated, batched=True, remove_columns=columns)
+
+
+class DynamicPaddingCollator:
+    """
+    Pads each batch to its own longest sequence (rounded up to
+    `pad_to_multiple_of`) and sets the padded label positions to -100.
+
+    The pad token is the EOS token here, so the mask comes from the attention
+    mask and not from the token id - real EOS separators still get a loss.
+    """
+
+    def __init__(self, pad_token_id, pad_to_multiple_of=8):
+        self.pad_token_id = pad_token_id
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def __call__(self, features):
+        longest = max(len(f["input_ids"]) for f in features)
+        if self.pad_to_multiple_of:
+            m = self.pad_to_multiple_of
+            longest = ((longest + m - 1) // m) * m
+
+        input_ids = torch.full((len(features), longest), self.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(features), longest), dtype=torch.long)
+        for i, f in enumerate(features):
+            ids = f["input_ids"]
+            input_ids[i, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[i, :len(ids)] = 1
+
+        labels = input_ids.masked_fill(attention_mask == 0, -100)
+        return {"input_ids": input_ids, "attention_mask": attention_mask, "labels": labels}
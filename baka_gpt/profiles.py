@@ -0,0 +1,113 @@
+"""
+Training profiles for tiny-gpt on CPU-only boxes.
+
+  default - the original settings (batch 2, no workers, fp32, torch's own
+            thread count)
+  fast    - bigger batches, DataLoader workers with prefetch, pinned torch
+            threads, bf16 autocast on CPU and gloo for multi-process runs
+
+Multi-process data parallel:
+    python train.py --profile fast --nproc 4
+re-launches the script through torchrun (gloo backend) and splits the cores
+between the ranks so they do not fight over the same threads.
+"""
+
+import argparse
+import os
+import sys
+
+PROFILES = {
+    "default": {
+        "batch_size": 2,
+        "grad_accum": 1,
+        "workers": 0,
+        "prefetch": None,
+        "threads": None,
+        "pin_threads": False,  # leave torch's thread settings alone
+        "bf16": False,
+        "cpu": False,
+    },
+    "fast": {
+        "batch_size": 16,
+        "grad_accum": 1,
+        "workers": 2,
+        "prefetch": 4,
+        "threads": None,  # None = cores / ranks
+        "pin_threads": True,
+        "bf16": True,
+        "cpu": True,
+    },
+}
+
+
+def add_profile_args(parser):
+    """Adds --profile, --nproc and the per-setting overrides to an ArgumentParser."""
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default")
+    parser.add_argument("--nproc", type=int, default=1, help="data-parallel CPU processes (gloo)")
+    parser.add_argument("--batch-size", type=int, help="per-process batch size")
+    parser.add_argument("--grad-accum", type=int, help="gradient accumulation steps")
+    parser.add_argument("--workers", type=int, help="DataLoader worker processes")
+    parser.add_argument("--prefetch", type=int, help="batches prefetched per worker")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads per process")
+    parser.add_argument("--bf16", action=argparse.BooleanOptionalAction, default=None, help="bf16 autocast on CPU")
+
+
+def resolve_profile(args):
+    """Profile values with any command-line overrides applied on top."""
+    settings = dict(PROFILES[args.profile])
+    for key in settings:
+        value = getattr(args, key, None)
+        if value is not None:
+            settings[key] = value
+    return settings
+
+
+def world_size():
+    return int(os.environ.get("WORLD_SIZE", "1"))
+
+
+def maybe_launch(nproc):
+    """
+    When asked for more than one process and not already running under
+    torchrun, re-run this script through torchrun and exit with its status.
+    """
+    if nproc <= 1 or "LOCAL_RANK" in os.environ:
+        return
+    from torch.distributed.run import main as torchrun
+
+    print(f"🚀 Launching {nproc} gloo processes")
+    torchrun(["--standalone", f"--nproc_per_node={nproc}", sys.argv[0], *sys.argv[1:]])
+    sys.exit(0)
+
+
+def configure_threads(settings):
+    """
+    Pins torch intra-op threads, splitting the cores evenly between ranks,
+    when the profile asks for it or `--threads` is given; otherwise torch
+    keeps its defaults (and OMP_NUM_THREADS etc. still apply). Returns the
+    pinned count or None.
+    """
+    if not settings["pin_threads"] and settings["threads"] is None:
+        return None
+    import torch
+
+    threads = settings["threads"] or max(1, (os.cpu_count() or 1) // world_size())
+    torch.set_num_threads(threads)
+    return threads
+
+
+def training_kwargs(settings):
+    """TrainingArguments keyword arguments for a resolved profile."""
+    kwargs = {
+        "per_device_train_batch_size": settings["batch_size"],
+        "gradient_accumulation_steps": settings["grad_accum"],
+        "dataloader_num_workers": settings["workers"],
+        "dataloader_pin_memory": not settings["cpu"],
+        "bf16": settings["bf16"],
+        "use_cpu": settings["cpu"],
+    }
+    if settings["workers"] > 0 and settings["prefetch"]:
+        kwargs["dataloader_prefetch_factor"] = settings["prefetch"]
+    if world_size() > 1:
+        kwargs["ddp_backend"] = "gloo"
+    return kwargs
@@ -0,0 +1,334 @@
+"""
+Batched local inference server for tiny-gpt.
+
+    python server.py --port 8000 --max-batch 16 --max-wait-ms 10
+
+    curl -s localhost:8000/generate -d '{"prompt": "The moon", "max_new_tokens": 50}'
+    curl -sN localhost:8000/generate -d '{"prompt": "The moon", "stream": true}'
+
+One model is loaded and shared by every client. Requests go into a queue and
+are batched dynamically: the scheduler waits up to `max_wait_ms` to gather a
+batch, prefills it with left padding, then decodes all active sequences one
+token per step. Batching is continuous - a finished sequence frees its slot
+right away and queued requests join the running batch at the next step
+instead of waiting for the whole batch to drain.
+
+Every sequence keeps its own KV cache; for each decode step the caches are
+left-padded to a common length and stacked, so sequences of different
+lengths can share a forward pass. Streaming responses are newline-delimited
+JSON sent with chunked transfer encoding; text is decoded incrementally, so a
+character split over several tokens is sent once it is complete. A client
+that disconnects frees its slot at the next step, and a failed model step
+only fails the requests in that step. Only the standard library is used for
+HTTP.
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from transformers import AutoTokenizer, GPT2LMHeadModel
+from transformers.cache_utils import DynamicCache
+
+
+class GenerationRequest:
+    def __init__(self, prompt_ids, max_new_tokens, temperature):
+        self.prompt_ids = prompt_ids
+        self.max_new_tokens = max_new_tokens
+        self.temperature = temperature
+        self.cache = None  # per-layer (key, value), shape (1, heads, len, dim)
+        self.length = 0    # positions held in the cache
+        self.last_token = None
+        self.output_ids = []
+        self.text = ""     # decoded text already handed out
+        self.done = False
+        self.cancelled = False  # client went away; dropped at the next step
+        self.error = None
+        self.tokens = asyncio.Queue()  # decoded text pieces, None when finished
+
+
+class BatchScheduler:
+    """Queues generation requests and runs them with continuous batching."""
+
+    def __init__(self, model, tokenizer, max_batch=16, max_wait_ms=10):
+        self.model = model.eval()
+        self.tokenizer = tokenizer
+        self.max_positions = model.config.n_positions
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.active = []
+        # torch work runs off the event loop so HTTP I/O keeps flowing
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+
+    def submit(self, prompt, max_new_tokens=50, temperature=0.0):
+        ids = self.tokenizer.encode(prompt)[-(self.max_positions - 1):] or [self.tokenizer.eos_token_id]
+        max_new_tokens = max(1, min(max_new_tokens, self.max_positions - len(ids)))
+        request = GenerationRequest(ids, max_new_tokens, temperature)
+        self.queue.put_nowait(request)
+        return request
+
+    def cancel(self, request):
+        """Frees the slot of a request nobody is waiting for any more."""
+        request.cancelled = True
+
+    # -- scheduling loop ------------------------------------------------------
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.active:
+                # idle: block for the first request, then hold a short window open
+                first = await self.queue.get()
+                new = [first]
+                deadline = loop.time() + self.max_wait
+                while len(new) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        new.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            else:
+                # busy: admit whatever is waiting into the free slots, no waiting
+                new = []
+                while len(self.active) + len(new) < self.max_batch and not self.queue.empty():
+                    new.append(self.queue.get_nowait())
+
+            new = [r for r in new if not r.cancelled]
+            if new:
+                await self._step(loop, self._prefill, new)
+                self.active.extend(r for r in new if not r.done)
+            self.active = [r for r in self.active if not r.done and not r.cancelled]
+            if self.active:
+                batch = list(self.active)
+                await self._step(loop, self._decode, batch)
+                self.active = [r for r in self.active if not r.done]
+
+    async def _step(self, loop, fn, batch):
+        """Runs one model step; if it raises, only the requests in `batch` fail."""
+        try:
+            logits = await loop.run_in_executor(self.executor, fn, batch)
+        except Exception as e:
+            for request in batch:
+                request.error = f"{type(e).__name__}: {e}"
+                self._finish(request)
+            return
+        self._emit(batch, logits)
+
+    def _finish(self, request):
+        request.done = True
+        request.cache = None
+        request.tokens.put_nowait(None)
+
+    def _emit(self, requests, logits):
+        for request, row in zip(requests, logits):
+            if request.cancelled:
+                self._finish(request)
+                continue
+            token = self._sample(row, request.temperature)
+            if token != self.tokenizer.eos_token_id:
+                request.output_ids.append(token)
+                request.last_token = token
+                # decode the whole output so multi-token characters come out whole
+                text = self.tokenizer.decode(request.output_ids)
+                if not text.endswith("�"):
+                    request.tokens.put_nowait(text[len(request.text):])
+                    request.text = text
+            if (token == self.tokenizer.eos_token_id or len(request.output_ids) >= request.max_new_tokens
+                    or request.length >= self.max_positions):
+                text = self.tokenizer.decode(request.output_ids)
+                if text != request.text:
+                    request.tokens.put_nowait(text[len(request.text):])  # an incomplete character at the end
+                    request.text = text
+                self._finish(request)
+
+    @staticmethod
+    def _sample(logits, temperature):
+        if temperature <= 0:
+            return int(torch.argmax(logits))
+        return int(torch.multinomial(torch.softmax(logits / temperature, dim=-1), 1))
+
+    # -- model work (executor thread) -----------------------------------------
+
+    @torch.inference_mode()
+    def _prefill(self, requests):
+        """Left-pads the prompts into one batch and splits the cache per request."""
+        longest = max(len(r.prompt_ids) for r in requests)
+        pad = self.tokenizer.eos_token_id
+        input_ids = torch.tensor([[pad] * (longest - len(r.prompt_ids)) + r.prompt_ids for r in requests])
+        mask = torch.tensor([[0] * (longest - len(r.prompt_ids)) + [1] * len(r.prompt_ids) for r in requests])
+        positions = (mask.cumsum(-1) - 1).clamp(min=0)
+
+        out = self.model(input_ids=input_ids, attention_mask=mask, position_ids=positions, use_cache=True)
+        layers = _legacy(out.past_key_values)
+        for i, r in enumerate(requests):
+            start = longest - len(r.prompt_ids)
+            r.cache = [(k[i:i + 1, :, start:], v[i:i + 1, :, start:]) for k, v in layers]
+            r.length = len(r.prompt_ids)
+        return out.logits[:, -1]
+
+    @torch.inference_mode()
+    def _decode(self, requests):
+        """One decode step for every active request, caches left-padded to a common length."""
+        longest = max(r.length for r in requests)
+        stacked = []
+        for layer in range(len(requests[0].cache)):
+            keys, values = [], []
+            for r in requests:
+                k, v = r.cache[layer]
+                gap = longest - r.length
+                keys.append(torch.nn.functional.pad(k, (0, 0, gap, 0)))
+                values.append(torch.nn.functional.pad(v, (0, 0, gap, 0)))
+            stacked.append((torch.cat(keys), torch.cat(values)))
+
+        input_ids = torch.tensor([[r.last_token] for r in requests])
+        mask = torch.tensor([[0] * (longest - r.length) + [1] * (r.length + 1) for r in requests])
+        positions = torch.tensor([[r.length] for r in requests])
+
+        out = self.model(
+            input_ids=input_ids,
+            attention_mask=mask,
+            position_ids=positions,
+            past_key_values=DynamicCache.from_legacy_cache(tuple(stacked)),
+            use_cache=True,
+        )
+        layers = _legacy(out.past_key_values)
+        for i, r in enumerate(requests):
+            r.length += 1
+            r.cache = [(k[i:i + 1, :, -r.length:], v[i:i + 1, :, -r.length:]) for k, v in layers]
+        return out.logits[:, -1]
+
+
+def _legacy(past):
+    return past.to_legacy_cache() if hasattr(past, "to_legacy_cache") else past
+
+
+# -- HTTP ---------------------------------------------------------------------
+
+async def read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None, None, None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    except asyncio.IncompleteReadError as e:
+        raise ValueError(f"body ended after {len(e.partial)} of {e.expected} bytes") from None
+    return method, path, body
+
+
+def parse_generate(body):
+    """Returns (prompt, max_new_tokens, temperature, stream); ValueError names the bad field."""
+    params = json.loads(body or b"{}")
+    if not isinstance(params, dict):
+        raise ValueError("request body must be a JSON object")
+    prompt = params.get("prompt", "")
+    max_new_tokens = params.get("max_new_tokens", 50)
+    temperature = params.get("temperature", 0.0)
+    stream = params.get("stream", False)
+    if not isinstance(prompt, str):
+        raise ValueError("prompt must be a string")
+    # bool is an int subclass, so `true` would otherwise pass as 1
+    if isinstance(max_new_tokens, bool) or not isinstance(max_new_tokens, int) or max_new_tokens < 1:
+        raise ValueError("max_new_tokens must be a positive integer")
+    if isinstance(temperature, bool) or not isinstance(temperature, (int, float)) or temperature < 0:
+        raise ValueError("temperature must be a non-negative number")
+    if not isinstance(stream, bool):
+        raise ValueError("stream must be true or false")
+    return prompt, max_new_tokens, float(temperature), stream
+
+
+def write_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+
+
+def write_chunk(writer, payload):
+    data = (json.dumps(payload) + "\n").encode()
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+
+async def respond(writer, request, prompt, stream):
+    if stream:
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        while (piece := await request.tokens.get()) is not None:
+            write_chunk(writer, {"token": piece})
+            await writer.drain()
+        if request.error:
+            write_chunk(writer, {"done": True, "error": request.error})
+        else:
+            write_chunk(writer, {"done": True, "generated_text": prompt + request.text})
+        writer.write(b"0\r\n\r\n")
+    else:
+        while await request.tokens.get() is not None:
+            pass
+        if request.error:
+            write_json(writer, "500 Internal Server Error", {"error": request.error})
+        else:
+            write_json(writer, "200 OK", [{"generated_text": prompt + request.text}])
+
+
+def make_handler(scheduler):
+    async def handle(reader, writer):
+        try:
+            method, path, body = await read_request(reader)
+            if method == "GET" and path == "/health":
+                write_json(writer, "200 OK", {"status": "ok", "active": len(scheduler.active),
+                                              "queued": scheduler.queue.qsize()})
+            elif method == "POST" and path == "/generate":
+                prompt, max_new_tokens, temperature, stream = parse_generate(body)
+                request = scheduler.submit(prompt, max_new_tokens, temperature)
+                try:
+                    await respond(writer, request, prompt, stream)
+                finally:
+                    if not request.done:
+                        scheduler.cancel(request)  # client disconnected or the handler was cancelled
+            elif method is not None:
+                write_json(writer, "404 Not Found", {"error": f"no route for {method} {path}"})
+            await writer.drain()
+        except (ValueError, json.JSONDecodeError) as e:
+            write_json(writer, "400 Bad Request", {"error": str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(model_dir, host, port, max_batch, max_wait_ms):
+    model = GPT2LMHeadModel.from_pretrained(model_dir)
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    scheduler = BatchScheduler(model, tokenizer, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    worker = asyncio.create_task(scheduler.run())
+
+    server = await asyncio.start_server(make_handler(scheduler), host, port)
+    print(f"🧠 TinyGPT server on http://{host}:{port} (batch ≤ {max_batch}, wait {max_wait_ms} ms)")
+    async with server:
+        await asyncio.gather(server.serve_forever(), worker)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve tiny-gpt with dynamic batching")
+    parser.add_argument("--model", default="tiny-gpt")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.model, args.host, args.port, args.max_batch, args.max_wait_ms))
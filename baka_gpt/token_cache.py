@@ -0,0 +1,153 @@
+"""
+Content-addressed cache for tokenized and packed training data.
+
+Cache layout (default `.token_cache/`):
+  files/<file sha256>-<tokenizer fp>.bin    - uint16 tokens of one text file
+  packed/<key>.npy                          - (n_blocks, block_size) uint16 blocks
+  packed/<key>.json                         - token count (the last block is padded)
+
+A file entry only depends on the file bytes and the tokenizer, so editing one
+file of a multi-file corpus re-tokenizes just that file. The packed entry is
+keyed on every file entry plus the block size, so hyperparameter sweeps and
+re-runs on unchanged data skip tokenization entirely. Every file is hashed
+once per run, and training reads the packed blocks through a memmap
+(`PackedBlockDataset`) instead of loading them into an in-memory Dataset.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from memmap_data import TOKEN_DTYPE, tokenize_to_file
+
+DEFAULT_CACHE_DIR = ".token_cache"
+PACKED_FORMAT = 2  # part of the packed key: bump when the layout changes
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """sha256 of a file, read in chunks so big corpora are never fully loaded."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def tokenizer_fingerprint(tokenizer):
+    """
+    Short hash of everything that changes token ids: vocab, merges,
+    normalization and special tokens. Fast tokenizers serialize all of that
+    in one JSON string; slow ones fall back to the vocab + special tokens.
+    """
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        payload = backend.to_str()
+    else:
+        payload = json.dumps(tokenizer.get_vocab(), sort_keys=True)
+    payload += json.dumps(tokenizer.special_tokens_map, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _atomic_path(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return f"{path}.tmp-{os.getpid()}"
+
+
+def cached_file_tokens(path, tokenizer, cache_dir=DEFAULT_CACHE_DIR, fingerprint=None, digest=None):
+    """Returns a read-only memmap of the tokens of one file, tokenizing it on a miss."""
+    fingerprint = fingerprint or tokenizer_fingerprint(tokenizer)
+    digest = digest or file_digest(path)
+    entry = os.path.join(cache_dir, "files", f"{digest}-{fingerprint}.bin")
+    if not os.path.exists(entry):
+        tmp = _atomic_path(entry)
+        with open(path, encoding="utf-8") as src, open(tmp, "wb") as out:
+            tokenize_to_file(src, tokenizer, out, batch_lines=1000)
+        os.replace(tmp, entry)
+    if os.path.getsize(entry) == 0:
+        return np.zeros(0, dtype=TOKEN_DTYPE)
+    return np.memmap(entry, dtype=TOKEN_DTYPE, mode="r")
+
+
+def cached_packed_blocks(paths, tokenizer, block_size, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Packs all files in `paths` (concatenated in order) into `block_size`
+    blocks, the last one padded with EOS, and returns (path of the .npy
+    entry, number of real tokens). Both the per-file tokens and the final
+    blocks come from the cache when nothing has changed.
+    """
+    fingerprint = tokenizer_fingerprint(tokenizer)
+    digests = [file_digest(p) for p in paths]
+    key = hashlib.sha256(json.dumps([digests, fingerprint, block_size, PACKED_FORMAT]).encode()).hexdigest()[:24]
+    entry = os.path.join(cache_dir, "packed", f"{key}.npy")
+    meta = os.path.join(cache_dir, "packed", f"{key}.json")
+
+    if os.path.exists(entry) and os.path.exists(meta):
+        print(f"♻️  Using cached packed dataset {entry}")
+        with open(meta) as f:
+            return entry, json.load(f)["num_tokens"]
+
+    parts = [cached_file_tokens(p, tokenizer, cache_dir, fingerprint, d) for p, d in zip(paths, digests)]
+    stream = np.concatenate(parts) if parts else np.zeros(0, dtype=TOKEN_DTYPE)
+    num_tokens = len(stream)
+    if num_tokens == 0:
+        raise ValueError(f"no tokens in {paths}")
+    n_blocks = -(-num_tokens // block_size)
+    if num_tokens % block_size:
+        print(f"⚠️  Padding the last block ({num_tokens % block_size} of {block_size} tokens)")
+    blocks = np.full(n_blocks * block_size, tokenizer.eos_token_id, dtype=TOKEN_DTYPE)
+    blocks[:num_tokens] = stream
+
+    tmp = _atomic_path(entry)
+    with open(tmp, "wb") as f:
+        np.save(f, blocks.reshape(n_blocks, block_size))
+    os.replace(tmp, entry)
+    tmp = _atomic_path(meta)
+    with open(tmp, "w") as f:
+        json.dump({"num_tokens": num_tokens}, f)
+    os.replace(tmp, meta)
+    return entry, num_tokens
+
+
+class PackedBlockDataset(Dataset):
+    """
+    Blocks of a packed cache entry, read through a memmap. Padding at the end
+    of the last block is masked out of attention and loss. Like
+    `MemmapBlockDataset`, the memmap is reopened in each DataLoader worker.
+    """
+
+    def __init__(self, path, num_tokens):
+        self.path = path
+        self.num_tokens = num_tokens
+        self._blocks = None
+        self.num_blocks, self.block_size = self.blocks.shape
+
+    @property
+    def blocks(self):
+        if self._blocks is None:
+            self._blocks = np.load(self.path, mmap_mode="r")
+        return self._blocks
+
+    def __len__(self):
+        return self.num_blocks
+
+    def __getitem__(self, i):
+        input_ids = torch.from_numpy(self.blocks[i].astype(np.int64))
+        attention_mask = torch.ones(self.block_size, dtype=torch.long)
+        attention_mask[max(0, self.num_tokens - i * self.block_size):] = 0
+        labels = input_ids.masked_fill(attention_mask == 0, -100)
+        return {"input_ids": input_ids, "attention_mask": attention_mask, "labels": labels}
+
+    def __getstate__(self):
+        # never pickle an open memmap into worker processes
+        state = self.__dict__.copy()
+        state["_blocks"] = None
+        return state
+
+
+def cached_packed_dataset(paths, tokenizer, block_size, cache_dir=DEFAULT_CACHE_DIR):
+    """`cached_packed_blocks` as a memmap-backed `PackedBlockDataset` with labels."""
+    return PackedBlockDataset(*cached_packed_blocks(paths, tokenizer, block_size, cache_dir))
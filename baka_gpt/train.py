@@ -1,25 +1,68 @@
+import argparse
+
 from datasets import load_dataset
 from transformers import AutoTokenizer, GPT2Config, GPT2LMHeadModel, Trainer, TrainingArguments
 
+from checkpointing import AsyncCheckpointCallback
+from memmap_data import EpochCallback, MemmapBlockDataset
+from packing import DynamicPaddingCollator, bucket_dataset, pack_dataset
+from profiles import add_profile_args, configure_threads, maybe_launch, resolve_profile, training_kwargs
+from token_cache import DEFAULT_CACHE_DIR, cached_packed_dataset
+
+BLOCK_SIZE = 128
+
+parser = argparse.ArgumentParser(description="Train the tiny GPT-2 model")
+parser.add_argument(
+    "--mode",
+    choices=["pack", "bucket", "pad", "memmap"],
+    default="pack",
+    help="pack: full EOS-separated blocks, bucket: length-grouped dynamic padding, "
+         "pad: legacy pad-to-128, memmap: random blocks from a pre-tokenized .bin",
+)
+parser.add_argument("--data", nargs="+", default=["data/my_poems.txt"], help="training text files")
+parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="tokenization cache (pack mode)")
+parser.add_argument("--no-cache", action="store_true", help="always re-tokenize in pack mode")
+parser.add_argument("--keep-last", type=int, default=2, help="checkpoints to keep (plus the best one)")
+parser.add_argument("--data-bin", default="data/poems", help="prefix written by memmap_data.py (memmap mode)")
+add_profile_args(parser)
+args = parser.parse_args()
+
+maybe_launch(args.nproc)
+profile = resolve_profile(args)
+configure_threads(profile)
+
 # Load tokenizer
 tokenizer = AutoTokenizer.from_pretrained("distilgpt2")
 tokenizer.pad_token = tokenizer.eos_token  # <-- Add this line
 
-# Load dataset
-dataset = load_dataset("text", data_files={"train": "data/my_poems.txt"})
+# Load dataset (memmap and cached pack modes read tokens directly)
+use_cache = args.mode == "pack" and not args.no_cache
+if args.mode != "memmap" and not use_cache:
+    dataset = load_dataset("text", data_files={"train": args.data})
 
 # Tokenize the data
 def tokenize_function(examples):
-    tokens = tokenizer(examples["text"], truncation=True, padding="max_length", max_length=128)
+    tokens = tokenizer(examples["text"], truncation=True, padding="max_length", max_length=BLOCK_SIZE)
     tokens["labels"] = tokens["input_ids"].copy()
     return tokens
 
-tokenized_dataset = dataset.map(tokenize_function, batched=True)
+data_collator = None
+if args.mode == "memmap":
+    train_dataset = MemmapBlockDataset(args.data_bin, BLOCK_SIZE)
+elif use_cache:
+    train_dataset = cached_packed_dataset(args.data, tokenizer, BLOCK_SIZE, args.cache_dir)
+elif args.mode == "pack":
+    train_dataset = pack_dataset(dataset["train"], tokenizer, BLOCK_SIZE)
+elif args.mode == "bucket":
+    train_dataset = bucket_dataset(dataset["train"], tokenizer, BLOCK_SIZE)
+    data_collator = DynamicPaddingCollator(tokenizer.pad_token_id)
+else:
+    train_dataset = dataset.map(tokenize_function, batched=True)["train"]
 
 # Build a tiny GPT model
 config = GPT2Config(
     vocab_size=tokenizer.vocab_size,
-    n_positions=128,
+    n_positions=BLOCK_SIZE,
     n_embd=128,
     n_layer=2,
     n_head=2
@@ -30,22 +73,30 @@ model = GPT2LMHeadModel(config)
 # Training arguments
 training_args = TrainingArguments(
     output_dir="./tiny-gpt",
-    per_device_train_batch_size=2,
     num_train_epochs=5,
-    save_strategy="epoch",
-    logging_steps=10
+    save_strategy="no",  # AsyncCheckpointCallback writes the epoch checkpoints
+    logging_steps=10,
+    group_by_length=args.mode == "bucket",
+    **training_kwargs(profile),
 )
 
+callbacks = [AsyncCheckpointCallback(training_args.output_dir, keep_last=args.keep_last)]
+if args.mode == "memmap":
+    callbacks.append(EpochCallback(train_dataset))  # fresh random windows every epoch
+
 # Trainer
 trainer = Trainer(
     model=model,
     args=training_args,
-    train_dataset=tokenized_dataset["train"]
+    train_dataset=train_dataset,
+    data_collator=data_collator,
+    callbacks=callbacks,
 )
 
 # Train the model
 trainer.train()
 
-# Save model and tokenizer
-model.save_pretrained("./tiny-gpt")
-tokenizer.save_pretrained("./tiny-gpt")
+# Save model and tokenizer (only once when running multi-process)
+if trainer.is_world_process_zero():
+    model.save_pretrained("./tiny-gpt")
+    tokenizer.save_pretrained("./tiny-gpt")
@@ -0,0 +1,272 @@
+"""
+Benchmark every text-generation entry point in the repo.
+
+    python benchmarks/generation.py                       # all workloads
+    python benchmarks/generation.py --only main4 tiny-gen --prompts 20
+    python benchmarks/generation.py --out before.json
+    python benchmarks/generation.py --out after.json --compare before.json
+
+Each workload imports its model and sampling settings from the script it
+measures (the constants its `main()` uses), so the two cannot drift apart:
+  main ... main6  baka/main*.py (gpt2 / distilgpt2 pipelines)
+  en_de           baka/en_de.py (opus-mt translation)
+  tiny-gen        baka_gpt/gen.py with the default fp32 pipeline
+  tiny-chat       baka_gpt/chat.py's KV-cached ChatEngine; prompts are sent
+                  as conversations of CHAT_TURNS turns (3), then the engine is
+                  reset, so the context stays bounded and every conversation
+                  measures the same thing
+Models are read from the local Hugging Face cache only (`HF_HUB_OFFLINE=1`,
+pass --online to allow downloads) and every prompt runs with a fixed seed.
+
+Reported per workload:
+  load_s              - pipeline / model construction
+  ttft_ms             - time to the first generated token (p50)
+  tokens_per_s        - generated tokens / generation time
+  latency_p50_ms/p99  - whole-call latency over the prompts
+  peak_rss_mb         - peak RSS of the workload
+
+Every workload runs in its own subprocess so load times are cold and peak
+RSS is not inherited from the workload before it.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKLOADS = {
+    # name: (folder, module) - the script whose settings the workload uses
+    "main": ("baka", "main"),
+    "main2": ("baka", "main2"),
+    "main3": ("baka", "main3"),
+    "main4": ("baka", "main4"),
+    "main5": ("baka", "main5"),
+    "main6": ("baka", "main6"),
+    "en_de": ("baka", "en_de"),
+    "tiny-gen": ("baka_gpt", "gen"),
+    "tiny-chat": ("baka_gpt", "chat"),
+}
+CHAT_PROMPT = "The moon"  # chat.py reads its prompts from stdin
+CHAT_TURNS = 3
+
+
+def load_workload(name):
+    """(task, model, prompt, generation kwargs) as set in the workload's script."""
+    folder, module_name = WORKLOADS[name]
+    path = os.path.join(REPO_ROOT, folder)
+    sys.path.insert(0, path)
+    module = importlib.import_module(module_name)
+    if name == "tiny-gen":
+        return ("text-generation", os.path.join(path, module.MODEL_DIR), module.PROMPT,
+                {"max_new_tokens": module.MAX_NEW_TOKENS})
+    if name == "tiny-chat":
+        return ("chat", os.path.join(path, module.MODEL_DIR), CHAT_PROMPT,
+                {"max_new_tokens": module.MAX_NEW_TOKENS, "turns": CHAT_TURNS})
+    return module.TASK, module.MODEL, module.PROMPT, dict(module.GENERATE_KWARGS)
+
+
+EXTRA_PROMPTS = [
+    "The moonlight drips like honey slow,",
+    "Stars whisper secrets just to me,",
+    "The breeze carries tales of old,",
+    "In shadows deep, where silence sings,",
+    "In twilight's arms, the world stands still,",
+]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024
+
+
+def percentile(values, q):
+    values = sorted(values)
+    k = (len(values) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def make_streamer():
+    """A generate() streamer that only records when each new token arrives."""
+    from transformers.generation.streamers import BaseStreamer
+
+    class TimingStreamer(BaseStreamer):
+        def __init__(self):
+            self.start = time.perf_counter()
+            self.first = None
+            self.tokens = 0
+            self._prompt_seen = False
+
+        def put(self, value):
+            # the first put() is the prompt (or decoder start token), not output
+            if not self._prompt_seen:
+                self._prompt_seen = True
+                return
+            if self.first is None:
+                self.first = time.perf_counter()
+            self.tokens += value.numel()
+
+        def end(self):
+            pass
+
+    return TimingStreamer()
+
+
+def build(task, model):
+    if task == "chat":
+        sys.path.insert(0, os.path.join(REPO_ROOT, "baka_gpt"))
+        from chat_engine import ChatEngine
+        from transformers import AutoTokenizer, GPT2LMHeadModel
+
+        return ChatEngine(GPT2LMHeadModel.from_pretrained(model), AutoTokenizer.from_pretrained(model))
+
+    from transformers import pipeline
+    return pipeline(task, model=model)
+
+
+def run_once(task, runner, prompt, kwargs, turn=0):
+    """Returns (latency_s, ttft_s, generated_tokens) for one prompt (`turn` of a chat)."""
+    if task == "chat":
+        runner.max_new_tokens = kwargs.get("max_new_tokens", 50)
+        if turn % kwargs.get("turns", 1) == 0:
+            runner.reset()  # start a new conversation
+        first, count = None, 0
+        start = time.perf_counter()
+
+        def on_token(_):
+            nonlocal first, count
+            first = first or time.perf_counter()
+            count += 1
+
+        runner.respond(prompt, on_token=on_token)
+        end = time.perf_counter()
+        return end - start, (first or end) - start, count
+
+    streamer = make_streamer()
+    runner(prompt, streamer=streamer, **kwargs)
+    end = time.perf_counter()
+    return end - streamer.start, (streamer.first or end) - streamer.start, streamer.tokens
+
+
+def bench(name, n_prompts, seed):
+    from transformers import set_seed
+
+    task, model, prompt, kwargs = load_workload(name)
+    start = time.perf_counter()
+    runner = build(task, model)
+    load_s = time.perf_counter() - start
+
+    prompts = ([prompt] + EXTRA_PROMPTS) * (n_prompts // (len(EXTRA_PROMPTS) + 1) + 1)
+    run_once(task, runner, prompt, kwargs)  # warm-up
+    latencies, ttfts, tokens, gen_time = [], [], 0, 0.0
+    for i, p in enumerate(prompts[:n_prompts]):
+        set_seed(seed + i)
+        latency, ttft, count = run_once(task, runner, p, kwargs, turn=i)
+        latencies.append(latency)
+        ttfts.append(ttft)
+        tokens += count
+        gen_time += latency
+
+    return {
+        "workload": name,
+        "task": task,
+        "model": os.path.relpath(model, REPO_ROOT) if os.path.isabs(model) else model,
+        "prompts": n_prompts,
+        "load_s": round(load_s, 3),
+        "ttft_ms": round(statistics.median(ttfts) * 1000, 2),
+        "tokens_per_s": round(tokens / gen_time, 2) if gen_time else 0.0,
+        "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Prints metrics that got worse than the baseline by more than `threshold`."""
+    with open(baseline_path) as f:
+        baseline = {r["workload"]: r for r in json.load(f)["results"]}
+    lower_is_better = ["load_s", "ttft_ms", "latency_p50_ms", "latency_p99_ms", "peak_rss_mb"]
+    regressions = 0
+    for r in results:
+        old = baseline.get(r["workload"])
+        if not old:
+            continue
+        checks = [(k, r[k], old[k], r[k] > old[k] * (1 + threshold)) for k in lower_is_better]
+        checks.append(("tokens_per_s", r["tokens_per_s"], old["tokens_per_s"],
+                       r["tokens_per_s"] < old["tokens_per_s"] * (1 - threshold)))
+        for key, new, prev, worse in checks:
+            if worse:
+                regressions += 1
+                print(f"❌ {r['workload']}.{key}: {prev} -> {new}")
+    print(f"{regressions} regression(s) beyond {threshold:.0%} vs {baseline_path}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the repo's text-generation workloads")
+    parser.add_argument("--only", nargs="+", choices=sorted(WORKLOADS), help="subset of workloads")
+    parser.add_argument("--prompts", type=int, default=10, help="prompts per workload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_generation.json")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging")
+    parser.add_argument("--online", action="store_true", help="allow model downloads")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.online:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+    if args.worker:
+        print(json.dumps(bench(args.worker, args.prompts, args.seed)))
+        sys.exit(0)
+
+    results = []
+    for name in args.only or WORKLOADS:
+        print(f"⏱️  {name} ...", flush=True)
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", name,
+             "--prompts", str(args.prompts), "--seed", str(args.seed)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            # e.g. model not in the local cache while offline - skip, keep the suite going
+            print(f"   skipped: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        print("   ", results[-1])
+
+    import torch
+    import transformers
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Wrote {args.out}")
+
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
@@ -0,0 +1,186 @@
+"""
+Startup time and import profile of the repo's CLI entry points.
+
+    python benchmarks/startup.py                      # all entry points
+    python benchmarks/startup.py --only kimicode-help --runs 20
+    python benchmarks/startup.py --profile kimicode-help --top 15
+    python benchmarks/startup.py --out after.json --compare before.json
+
+Every entry point is started in a fresh interpreter, `--runs` times, and the
+wall-clock time until it exits is recorded (p50/min/max). `--profile` runs
+one entry point once under `python -X importtime` and prints the modules with
+the largest cumulative import time - the usual suspects are langchain,
+qdrant_client, transformers and torch, which no `--help` should need.
+
+Only commands that do not touch the network are measured, so the numbers
+are about imports and setup, not API latency. "kimicode-ask-cached" asks a
+question whose answer is already in a throwaway answer cache (MANIFEST_DIR
+points at a temp dir), i.e. the path that must not load LangChain or Gemini.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    # name: (working directory, argv after `python`)
+    "python": (REPO_ROOT, ["-c", "pass"]),  # interpreter floor
+    "kimicode-help": ("kimicode", ["ingest_and_chat.py", "--help"]),
+    "kimicode-ask-help": ("kimicode", ["ingest_and_chat.py", "ask", "--help"]),
+    "kimicode-ask-cached": ("kimicode", ["ingest_and_chat.py", "ask", "What is this document about?"]),
+    "groq_agent-help": ("llms", ["groq_agent.py", "--help"]),
+    "stack_OVF-help": ("llms", ["stack_OVF.py", "--help"]),
+    "tweet_groq-help": ("llms", ["tweet_groq.py", "--help"]),
+    "copy_code-help": ("llms", ["copy_code.py", "--help"]),
+    "en_de-help": ("baka", ["en_de.py", "--help"]),
+    "bench-generation-help": ("benchmarks", ["generation.py", "--help"]),
+}
+
+
+class _UnitEmbeddings:
+    """Only used to seed the answer cache; the timed run never embeds (exact repeat)."""
+
+    def embed_query(self, text):
+        return [1.0]
+
+
+def seed_answer_cache(env):
+    """Puts the benchmark question into a fresh answer cache under a temp MANIFEST_DIR."""
+    env["MANIFEST_DIR"] = tempfile.mkdtemp(prefix="startup-bench-")
+    os.environ["MANIFEST_DIR"] = env["MANIFEST_DIR"]
+    sys.path.insert(0, os.path.join(REPO_ROOT, "kimicode"))
+    import ingest_and_chat
+
+    question = ENTRY_POINTS["kimicode-ask-cached"][1][-1]
+    ingest_and_chat.open_answer_cache(_UnitEmbeddings(), ingest_and_chat.open_manifest()).put(
+        question, "benchmark answer")
+
+
+SETUP = {
+    # name: fn(env) run once before timing; may add to the subprocess environment
+    "kimicode-ask-cached": seed_answer_cache,
+}
+EXPECT = {
+    # name: text the output must contain, so the intended path is the one timed
+    "kimicode-ask-cached": "(cached",
+}
+
+
+def run(name, extra=(), env=None):
+    cwd, argv = ENTRY_POINTS[name]
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, *extra, *argv], cwd=os.path.join(REPO_ROOT, cwd),
+                          capture_output=True, text=True, env=env)
+    return time.perf_counter() - start, proc
+
+
+def prepare(name):
+    env = dict(os.environ)
+    if name in SETUP:
+        try:
+            SETUP[name](env)
+        except ImportError as e:
+            raise RuntimeError(f"{name} setup failed: {e}") from e
+    return env
+
+
+def time_startup(name, runs):
+    env = prepare(name)
+    samples = []
+    for _ in range(runs):
+        elapsed, proc = run(name, env=env)
+        if proc.returncode != 0:
+            last = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode
+            raise RuntimeError(f"{name} exited with {proc.returncode}: {last}")
+        if EXPECT.get(name, "") not in proc.stdout:
+            raise RuntimeError(f"{name} did not take the expected path (no {EXPECT[name]!r} in its output)")
+        samples.append(elapsed * 1000)
+    return {
+        "entry_point": name,
+        "p50_ms": round(statistics.median(samples), 1),
+        "min_ms": round(min(samples), 1),
+        "max_ms": round(max(samples), 1),
+        "runs": runs,
+    }
+
+
+def import_profile(name):
+    """Returns [(cumulative_us, self_us, module)] from `-X importtime`, slowest first."""
+    _, proc = run(name, ["-X", "importtime"], env=prepare(name))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), module.strip()))
+    return sorted(rows, reverse=True)
+
+
+def print_profile(name, top):
+    rows = import_profile(name)
+    total = sum(s for _, s, _ in rows)
+    print(f"📦 {name}: {len(rows)} modules imported, {total / 1000:.1f} ms in imports")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, self_us, module in rows[:top]:
+        print(f"{cumulative / 1000:14.1f} {self_us / 1000:9.1f}  {module}")
+
+
+def compare(results, baseline_path, threshold):
+    """Prints entry points whose p50 got slower than the baseline by more than `threshold`."""
+    with open(baseline_path) as f:
+        baseline = {r["entry_point"]: r for r in json.load(f)["results"]}
+    regressions = 0
+    for r in results:
+        old = baseline.get(r["entry_point"])
+        if old and r["p50_ms"] > old["p50_ms"] * (1 + threshold):
+            regressions += 1
+            print(f"❌ {r['entry_point']}.p50_ms: {old['p50_ms']} -> {r['p50_ms']}")
+    print(f"{regressions} regression(s) beyond {threshold:.0%} vs {baseline_path}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure CLI startup time and import cost")
+    parser.add_argument("--only", nargs="+", choices=sorted(ENTRY_POINTS), help="subset of entry points")
+    parser.add_argument("--runs", type=int, default=10, help="cold starts per entry point")
+    parser.add_argument("--profile", choices=sorted(ENTRY_POINTS), help="print an import-time profile instead")
+    parser.add_argument("--top", type=int, default=25, help="modules shown by --profile")
+    parser.add_argument("--out", default="bench_startup.json")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    if args.profile:
+        print_profile(args.profile, args.top)
+        sys.exit(0)
+
+    results = []
+    for name in args.only or ENTRY_POINTS:
+        print(f"⏱️  {name} ...", flush=True)
+        try:
+            results.append(time_startup(name, args.runs))
+        except RuntimeError as e:
+            # e.g. a dependency missing in this environment - skip, keep the suite going
+            print(f"   skipped: {e}")
+            continue
+        print("   ", results[-1])
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Wrote {args.out}")
+
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare, args.threshold) else 0)
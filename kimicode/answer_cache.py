@@ -0,0 +1,118 @@
+"""
+Two-level cache for the RetrievalQA chat loop.
+
+  1. CachedRetriever     exact normalized question -> retrieved chunks
+     (cached_retriever)  (their ids and content), so a repeated question
+                         skips the vector search
+  2. SemanticAnswerCache question embedding -> final answer; a new question
+                         whose embedding has cosine >= `threshold` with a
+                         cached one reuses that answer without calling the LLM
+
+Both are tagged with the collection version (a hash of every chunk id in the
+ingest manifest). When the collection changes, everything cached for the old
+version is dropped. The answer cache is persisted to a small JSONL file (a
+version header, then one line per answer, appended by `put`) so repeat
+questions are answered instantly across sessions too; the file is only
+rewritten when the version changed or it grew well past `max_entries`. A
+question is embedded at most once: `get` keeps the vector of its last miss
+for the `put` that follows. This module does not import LangChain, so the
+cached-answer path starts fast.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from embedding_cache import normalize_text
+
+
+def normalize_question(question):
+    return normalize_text(question).lower().rstrip("?!. ")
+
+
+class SemanticAnswerCache:
+    def __init__(self, embeddings, version, path=None, threshold=0.95, max_entries=5000):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.path = path
+        self.version = version
+        self.questions, self.answers = [], []
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self._file_lines = None  # answer lines in the file; None = file must be rewritten
+        self._last = None  # (normalized question, vector) of the last miss in get()
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            header = f.readline()
+            if not header or json.loads(header).get("version") != self.version:
+                return  # collection changed since these answers were cached
+            entries = [json.loads(line) for line in f if line.strip()]
+        self._file_lines = len(entries)
+        entries = entries[-self.max_entries:]
+        self.questions = [e["q"] for e in entries]
+        self.answers = [e["a"] for e in entries]
+        if entries:
+            self.vectors = np.asarray([e["v"] for e in entries], dtype=np.float32)
+
+    @staticmethod
+    def _line(question, answer, vector):
+        return json.dumps({"q": question, "a": answer, "v": vector.tolist()}, ensure_ascii=False) + "\n"
+
+    def _rewrite(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": self.version}) + "\n")
+            for q, a, v in zip(self.questions, self.answers, self.vectors):
+                f.write(self._line(q, a, v))
+        os.replace(tmp, self.path)
+        self._file_lines = len(self.questions)
+
+    def _save(self, question, answer, vector):
+        if not self.path:
+            return
+        # compact once the file holds a quarter more lines than the cache keeps
+        if self._file_lines is None or self._file_lines >= self.max_entries * 5 // 4:
+            self._rewrite()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(self._line(question, answer, vector))
+        self._file_lines += 1
+
+    def _embed(self, normalized):
+        if self._last is not None and self._last[0] == normalized:
+            return self._last[1]
+        v = np.asarray(self.embeddings.embed_query(normalized), dtype=np.float32)
+        v = v / max(float(np.linalg.norm(v)), 1e-12)
+        self._last = (normalized, v)
+        return v
+
+    def get(self, question):
+        """Returns (answer, similarity) for the closest cached question, or (None, best)."""
+        if not self.questions:
+            return None, 0.0
+        normalized = normalize_question(question)
+        for n, cached in enumerate(self.questions):
+            if normalize_question(cached) == normalized:
+                return self.answers[n], 1.0  # exact repeat: no embedding needed
+        scores = self.vectors @ self._embed(normalized)
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return self.answers[best], float(scores[best])
+        return None, float(scores[best])
+
+    def put(self, question, answer):
+        """Caches `answer`, reusing the vector `get` computed for the same question."""
+        v = self._embed(normalize_question(question))
+        self.vectors = v[None, :] if not self.questions else np.concatenate([self.vectors, v[None, :]])
+        self.questions.append(question)
+        self.answers.append(answer)
+        if len(self.questions) > self.max_entries:
+            # oldest first out
+            drop = len(self.questions) - self.max_entries
+            self.questions, self.answers = self.questions[drop:], self.answers[drop:]
+            self.vectors = self.vectors[drop:]
+        self._save(question, answer, v)
@@ -0,0 +1,98 @@
+"""
+Exact-match cache in front of a LangChain retriever (level 1 of the chat
+loop's cache, see answer_cache.py). Results are tagged with the collection
+version and dropped when it changes.
+
+Level 2 already answers exact repeats, so this level does its work on the
+questions that reach the chain anyway: a retry after the LLM call failed,
+a question whose answer was evicted, and every question when the answer
+cache is turned off (ANSWER_CACHE=off). Like the answer cache, it is kept
+in a JSONL file (a version header, then one line per question) so it
+survives restarts.
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from answer_cache import normalize_question
+
+
+class RetrievalCache:
+    """Normalized question -> retrieved chunks (id, text, metadata), oldest first out."""
+
+    def __init__(self, version, path=None, max_entries=5000):
+        self.version = version
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._file_lines = None  # question lines in the file; None = file must be rewritten
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            header = f.readline()
+            if not header or json.loads(header).get("version") != self.version:
+                return  # collection changed since these chunks were retrieved
+            lines = [json.loads(line) for line in f if line.strip()]
+        self._file_lines = len(lines)
+        for e in lines:
+            self.entries[e["q"]] = e["docs"]
+            self.entries.move_to_end(e["q"])
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def _line(question, docs):
+        return json.dumps({"q": question, "docs": docs}, ensure_ascii=False) + "\n"
+
+    def _save(self, question, docs):
+        if not self.path:
+            return
+        if self._file_lines is None or self._file_lines >= self.max_entries * 5 // 4:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"version": self.version}) + "\n")
+                for q, d in self.entries.items():
+                    f.write(self._line(q, d))
+            os.replace(tmp, self.path)
+            self._file_lines = len(self.entries)
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(self._line(question, docs))
+        self._file_lines += 1
+
+    def get(self, question):
+        return self.entries.get(normalize_question(question))
+
+    def put(self, question, docs):
+        normalized = normalize_question(question)
+        self.entries[normalized] = docs
+        self.entries.move_to_end(normalized)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._save(normalized, docs)
+
+
+class CachedRetriever(BaseRetriever):
+    """Wraps a retriever with an exact-match cache of its results."""
+
+    retriever: BaseRetriever
+    cache: RetrievalCache
+    hits: int = 0
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        cached = self.cache.get(query)
+        if cached is not None:
+            self.hits += 1
+            return [Document(page_content=c["text"], metadata=c["metadata"], id=c["id"]) for c in cached]
+        docs = self.retriever.invoke(query)
+        self.cache.put(query, [{"id": d.id, "text": d.page_content, "metadata": d.metadata} for d in docs])
+        return docs
@@ -0,0 +1,175 @@
+"""
+On-disk embedding cache and an offline sentence-embedding backend.
+
+    embeddings = CachedEmbeddings(GoogleGenerativeAIEmbeddings(...), "models/text-embedding-004")
+    embeddings = CachedEmbeddings(LocalSentenceEmbeddings(), "all-MiniLM-L6-v2")
+
+`CachedEmbeddings` wraps any LangChain `Embeddings` (or a zero-argument
+factory for one, so the real client is only built on the first cache miss).
+Vectors are stored as float32 blobs in one SQLite file, keyed on (model,
+kind, hash of the normalized text) - kind is "doc" or "query" because
+retrieval models embed the two differently. Only texts that miss the cache
+reach the wrapped model, and each distinct text is sent once per batch. When
+the cache grows past `max_entries`, the least recently used vectors are
+evicted.
+
+LangChain is not imported here, so the cached-answer path starts without it;
+`register_langchain()` makes both classes count as LangChain `Embeddings` once
+a vector store that checks for it is built.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+DEFAULT_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".embedding_cache.sqlite")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """NFC, collapsed whitespace, stripped - cosmetic differences share one entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class CachedEmbeddings:
+    def __init__(self, underlying, model, path=DEFAULT_CACHE, max_entries=500_000, batch_size=100):
+        self._underlying = underlying
+        self.model = model
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.hits = self.misses = 0
+        # ingestion may embed from worker threads, so share one guarded connection
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB, last_used REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+
+    @property
+    def underlying(self):
+        # a class or zero-argument factory is only called on the first miss
+        if isinstance(self._underlying, type) or not hasattr(self._underlying, "embed_documents"):
+            self._underlying = self._underlying()
+        return self._underlying
+
+    def _key(self, kind, text):
+        return hashlib.sha256(f"{self.model}\0{kind}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys):
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique), 500):  # stay under SQLite's variable limit
+                chunk = unique[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self.db.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", chunk)
+                found.update((k, np.frombuffer(v, dtype=np.float32).tolist()) for k, v in rows)
+            if found:
+                now = time.time()
+                self.db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?",
+                                    [(now, k) for k in found])
+                self.db.commit()
+        return found
+
+    def _store(self, pairs):
+        now = time.time()
+        with self._lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                [(k, np.asarray(v, dtype=np.float32).tobytes(), now) for k, v in pairs],
+            )
+            count = self.db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.max_entries:
+                self.db.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self.db.commit()
+
+    def embed_documents(self, texts):
+        keys = [self._key("doc", t) for t in texts]
+        found = self._lookup(keys)
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        self.hits += len(texts) - sum(1 for k in keys if k in missing)
+        self.misses += len(missing)
+
+        items = list(missing.items())
+        for i in range(0, len(items), self.batch_size):
+            batch = items[i:i + self.batch_size]
+            vectors = self.underlying.embed_documents([t for _, t in batch])
+            pairs = [(k, v) for (k, _), v in zip(batch, vectors)]
+            self._store(pairs)
+            found.update(pairs)
+        return [list(found[k]) for k in keys]
+
+    def embed_query(self, text):
+        key = self._key("query", text)
+        found = self._lookup([key])
+        if key in found:
+            self.hits += 1
+            return found[key]
+        self.misses += 1
+        vector = self.underlying.embed_query(text)
+        self._store([(key, vector)])
+        return vector
+
+    async def aembed_documents(self, texts):
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text):
+        return await asyncio.to_thread(self.embed_query, text)
+
+
+class LocalSentenceEmbeddings:
+    """
+    Offline CPU embeddings with sentence-transformers (optional dependency:
+    `pip install sentence-transformers`). Vectors are L2-normalized, which is
+    what the cosine collections expect anyway.
+    """
+
+    def __init__(self, model_name="sentence-transformers/all-MiniLM-L6-v2", batch_size=64, device="cpu"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "LocalSentenceEmbeddings needs sentence-transformers: pip install sentence-transformers"
+            ) from e
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_name, device=device)
+
+    def embed_documents(self, texts):
+        vectors = self.model.encode(list(texts), batch_size=self.batch_size,
+                                    normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts):
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text):
+        return await asyncio.to_thread(self.embed_query, text)
+
+
+def register_langchain():
+    """Registers both classes as virtual subclasses of LangChain's `Embeddings`."""
+    from langchain_core.embeddings import Embeddings
+
+    Embeddings.register(CachedEmbeddings)
+    Embeddings.register(LocalSentenceEmbeddings)
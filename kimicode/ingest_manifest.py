@@ -0,0 +1,136 @@
+"""
+Incremental, content-hashed ingestion for the PDF RAG pipeline.
+
+The manifest remembers, per source file, the hash of every page and the ids
+of the chunks that came from it:
+
+    {"sources": {"/path/my_document.pdf": {
+        "pages":  {"0": {"hash": "...", "chunks": ["<uuid>", ...]}, ...}}}}
+
+On a re-run only pages whose text changed are split again. Chunk ids are
+UUIDs derived from (source, page, chunk text, occurrence on the page), so an
+unchanged chunk keeps its id even when the text around it on the page
+changed. Only chunks whose id is new are embedded and upserted, and ids that
+disappeared are deleted from the vector store. Re-ingesting an unchanged PDF
+embeds nothing.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+
+NAMESPACE = uuid.UUID("6f1d7c3e-8a51-4c1e-9d7b-2f0f3b8c1a42")
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(source, page, text, occurrence=0):
+    """Stable UUID for a chunk (Qdrant only accepts UUIDs or integers as ids)."""
+    return str(uuid.uuid5(NAMESPACE, f"{source}\0{page}\0{occurrence}\0{text_hash(text)}"))
+
+
+class IngestManifest:
+    def __init__(self, path):
+        self.path = path
+        self.data = {"sources": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def source(self, source):
+        return self.data["sources"].setdefault(source, {"pages": {}})
+
+    def reset(self):
+        """Forget everything - use when the collection itself was (re)created."""
+        self.data = {"sources": {}}
+
+    def fingerprint(self):
+        """Hash of every chunk id - changes whenever the collection content changes."""
+        ids = sorted(
+            cid
+            for entry in self.data["sources"].values()
+            for page in entry["pages"].values()
+            for cid in page["chunks"]
+        )
+        return hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()[:16]
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+class IncrementalSync:
+    """
+    Streaming form of `sync_pages`: feed pages one at a time with `page()`,
+    which returns only the (chunk, id) pairs that must be embedded, then call
+    `finish()` once everything was written to delete stale chunks and save
+    the manifest.
+    """
+
+    def __init__(self, splitter, manifest, source):
+        self.splitter = splitter
+        self.manifest = manifest
+        self.source = source
+        self.old_pages = manifest.source(source)["pages"]
+        self.old_ids = {cid for p in self.old_pages.values() for cid in p["chunks"]}
+        self.new_pages = {}
+        self.added = 0
+        self.pages_changed = 0
+
+    def page(self, page, n=0):
+        key = str(page.metadata.get("page", n))
+        digest = text_hash(page.page_content)
+        previous = self.old_pages.get(key)
+        if previous and previous["hash"] == digest:
+            self.new_pages[key] = previous
+            return []
+
+        self.pages_changed += 1
+        ids, fresh, seen = [], [], {}
+        for chunk in self.splitter.split_documents([page]):
+            occurrence = seen.get(chunk.page_content, 0)
+            seen[chunk.page_content] = occurrence + 1
+            cid = chunk_id(self.source, key, chunk.page_content, occurrence)
+            ids.append(cid)
+            # chunks already stored under the same id are not embedded again
+            if cid not in self.old_ids:
+                fresh.append((chunk, cid))
+        self.new_pages[key] = {"hash": digest, "chunks": ids}
+        self.added += len(fresh)
+        return fresh
+
+    def finish(self, vectorstore):
+        new_ids = {cid for p in self.new_pages.values() for cid in p["chunks"]}
+        stale = sorted(self.old_ids - new_ids)
+        if stale:
+            vectorstore.delete(ids=stale)
+
+        self.manifest.source(self.source)["pages"] = self.new_pages
+        self.manifest.save()
+        return {
+            "added": self.added,
+            "deleted": len(stale),
+            "unchanged": len(new_ids) - self.added,
+            "pages_changed": self.pages_changed,
+        }
+
+
+def sync_pages(pages, splitter, vectorstore, manifest, source, batch_size=64):
+    """
+    Brings `vectorstore` in line with `pages` (LangChain Documents, one per
+    page) for one source file. Returns {"added", "deleted", "unchanged",
+    "pages_changed"} counts. The manifest is saved only after the store was
+    updated, so an interrupted run is simply redone next time.
+    """
+    sync = IncrementalSync(splitter, manifest, source)
+    fresh = [pair for n, page in enumerate(pages) for pair in sync.page(page, n)]
+    for i in range(0, len(fresh), batch_size):
+        batch = fresh[i:i + batch_size]
+        vectorstore.add_documents([d for d, _ in batch], ids=[c for _, c in batch])
+    return sync.finish(vectorstore)
@@ -0,0 +1,160 @@
+"""
+Pipelined PDF ingestion: parse -> chunk -> embed -> upsert, all overlapped.
+
+  parse   a process pool extracts page text with pypdf, at most
+          `2 * workers` pages in flight, yielded in page order; workers are
+          spawned, not forked, because by then the process already runs
+          threads, an asyncio loop and gRPC channels that do not survive fork
+  chunk   the calling thread splits changed pages (IncrementalSync) and
+          groups new chunks into batches
+  embed   a thread embeds one batch while the next one is being parsed
+  upsert  a thread writes the previous batch's vectors to the store
+
+Stages talk through bounded queues, so at most a few batches exist at any
+time: peak memory follows the batch size, not the PDF size, and the total
+time approaches that of the slowest stage instead of the sum of all of them.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from ingest_manifest import IncrementalSync
+
+_DONE = object()
+_reader = None
+
+
+def _open_reader(path):
+    global _reader
+    from pypdf import PdfReader
+    _reader = PdfReader(path)
+
+
+def _extract(page_no):
+    return page_no, _reader.pages[page_no].extract_text() or ""
+
+
+def page_count(path):
+    from pypdf import PdfReader
+    return len(PdfReader(path).pages)
+
+
+def iter_pages(path, workers=None):
+    """Yields one Document per page, in order, parsed by a process pool."""
+    # imported here so spawned workers, which import this module, skip LangChain
+    from langchain_core.documents import Document
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    total = page_count(path)
+    source = os.path.abspath(path)
+    window = 2 * workers
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_open_reader, initargs=(path,)) as pool:
+        pending = [pool.submit(_extract, n) for n in range(min(window, total))]
+        submitted = len(pending)
+        while pending:
+            page_no, text = pending.pop(0).result()
+            if submitted < total:
+                pending.append(pool.submit(_extract, submitted))
+                submitted += 1
+            yield Document(page_content=text, metadata={"source": source, "page": page_no})
+
+
+def write_vectors(vectorstore, docs, ids, vectors, writer=None):
+    """
+    Stores pre-computed vectors without embedding the documents again. With a
+    `writer` (AsyncUpsertWriter) the call only queues the batch.
+    """
+    if writer is not None:
+        writer.write(docs, ids, vectors)
+    elif hasattr(vectorstore, "add_vectors"):  # LocalVectorStore
+        vectorstore.add_vectors(vectors, [d.page_content for d in docs], [d.metadata for d in docs], ids,
+                                persist=False)
+    elif hasattr(vectorstore, "client") and hasattr(vectorstore, "collection_name"):  # LangChain Qdrant
+        from qdrant_client.models import PointStruct
+
+        vectorstore.client.upsert(
+            collection_name=vectorstore.collection_name,
+            points=[
+                PointStruct(id=i, vector=v, payload={
+                    vectorstore.content_payload_key: d.page_content,
+                    vectorstore.metadata_payload_key: d.metadata,
+                })
+                for d, i, v in zip(docs, ids, vectors)
+            ],
+        )
+    else:
+        vectorstore.add_documents(docs, ids=ids)
+
+
+class _Stage(threading.Thread):
+    """Runs `fn` on every item of `inbox`, passing results on to `outbox`."""
+
+    def __init__(self, name, fn, inbox, outbox=None):
+        super().__init__(name=name, daemon=True)
+        self.fn, self.inbox, self.outbox = fn, inbox, outbox
+        self.error = None
+
+    def run(self):
+        while (item := self.inbox.get()) is not _DONE:
+            if self.error is not None:
+                continue  # drain so upstream never blocks on a dead stage
+            try:
+                result = self.fn(item)
+                if self.outbox is not None:
+                    self.outbox.put(result)
+            except BaseException as e:
+                self.error = e
+        if self.outbox is not None:
+            self.outbox.put(_DONE)
+
+
+def ingest_pdf(path, splitter, embeddings, vectorstore, manifest, batch_size=64, workers=None, depth=2,
+               writer=None):
+    """
+    Streams `path` into `vectorstore`, embedding only new/changed chunks.
+    Pass an AsyncUpsertWriter as `writer` to keep several Qdrant upserts in
+    flight. Returns the same stats dict as `sync_pages`.
+    """
+    sync = IncrementalSync(splitter, manifest, os.path.abspath(path))
+    to_embed = queue.Queue(maxsize=depth)
+    to_write = queue.Queue(maxsize=depth)
+
+    def embed(batch):
+        docs = [d for d, _ in batch]
+        return docs, [i for _, i in batch], embeddings.embed_documents([d.page_content for d in docs])
+
+    def write(item):
+        write_vectors(vectorstore, *item, writer=writer)
+
+    stages = [_Stage("embed", embed, to_embed, to_write), _Stage("upsert", write, to_write)]
+    for stage in stages:
+        stage.start()
+
+    batch = []
+    try:
+        for n, page in enumerate(iter_pages(path, workers)):
+            batch.extend(sync.page(page, n))
+            while len(batch) >= batch_size:
+                to_embed.put(batch[:batch_size])
+                batch = batch[batch_size:]
+            if any(stage.error for stage in stages):
+                break
+        if batch:
+            to_embed.put(batch)
+    finally:
+        to_embed.put(_DONE)
+        for stage in stages:
+            stage.join()
+
+    for stage in stages:
+        if stage.error is not None:
+            raise stage.error
+    if writer is not None:
+        writer.flush()
+    if hasattr(vectorstore, "persist"):
+        vectorstore.persist()
+    return sync.finish(vectorstore)
@@ -0,0 +1,204 @@
+"""
+Local, persistent vector store with the same LangChain interface as the
+Qdrant store used in ingest_and_chat.py.
+
+    store = LocalVectorStore.from_documents(chunks, embeddings, path="local_index")
+    retriever = store.as_retriever(search_kwargs={"k": 4})
+
+Layout of `path`:
+  vectors.npy    - float32 (n, dim) matrix of L2-normalized vectors,
+                   opened with mmap so a big index is not read into RAM
+  records.jsonl  - one {"id", "text", "metadata"} line per row
+  hnsw.bin       - optional HNSW graph (only when `hnswlib` is installed and
+                   the store has at least `ann_threshold` rows); labels are
+                   row numbers, new rows are added to it incrementally
+
+Search is cosine similarity, like the Qdrant collection: an exact top-k over a
+single vectorized matrix-vector product, or the HNSW index for collections
+larger than `ann_threshold` rows. No network, so it also works offline and in
+tests.
+"""
+
+import json
+import os
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+try:
+    import hnswlib
+except ImportError:  # optional: exact search works without it
+    hnswlib = None
+
+EF_SEARCH = 64
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class LocalVectorStore(VectorStore):
+    def __init__(self, embedding, path=None, ann_threshold=50_000):
+        self.embedding = embedding
+        self.path = path
+        self.ann_threshold = ann_threshold
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.records = []
+        self._ann = None
+        if path and os.path.exists(os.path.join(path, "vectors.npy")):
+            self._load()
+
+    @property
+    def embeddings(self):
+        return self.embedding
+
+    def __len__(self):
+        return len(self.records)
+
+    # -- persistence ----------------------------------------------------------
+
+    def _load(self):
+        with open(os.path.join(self.path, "records.jsonl"), encoding="utf-8") as f:
+            self.records = [json.loads(line) for line in f]
+        if not self.records:
+            # an empty file cannot be memory-mapped
+            self.vectors = np.zeros((0, 0), dtype=np.float32)
+            return
+        self.vectors = np.load(os.path.join(self.path, "vectors.npy"), mmap_mode="r")
+        self._ann = None
+        ann_path = os.path.join(self.path, "hnsw.bin")
+        if hnswlib is not None and len(self.records) >= self.ann_threshold and os.path.exists(ann_path):
+            index = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+            index.load_index(ann_path)
+            index.set_ef(EF_SEARCH)  # not stored in the file
+            if index.get_current_count() <= len(self.records):
+                self._ann = index  # rows added since it was saved go in on the next persist()
+
+    def persist(self):
+        """Writes the matrix and records to `path` (atomically, file by file)."""
+        self._update_ann()
+        if not self.path:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        vectors_path = os.path.join(self.path, "vectors.npy")
+        with open(vectors_path + ".tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(self.vectors))
+        with open(os.path.join(self.path, "records.jsonl.tmp"), "w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(vectors_path + ".tmp", vectors_path)
+        os.replace(os.path.join(self.path, "records.jsonl.tmp"), os.path.join(self.path, "records.jsonl"))
+        ann_path = os.path.join(self.path, "hnsw.bin")
+        if self._ann is not None:
+            self._ann.save_index(ann_path)
+        elif os.path.exists(ann_path):
+            os.remove(ann_path)  # below the threshold: its labels would be stale on the next load
+        # reopen as a memmap so the in-memory copy can be released
+        ann = self._ann
+        self._load()
+        self._ann = ann
+
+    # -- writes ---------------------------------------------------------------
+
+    def add_vectors(self, vectors, texts, metadatas=None, ids=None, persist=True):
+        """
+        Adds pre-computed embeddings and returns the ids of the new rows.
+        Bulk loaders pass `persist=False` and call `persist()` once at the end
+        instead of rewriting the matrix after every batch.
+        """
+        vectors = _normalize(vectors)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = [str(i) for i in ids] if ids else [str(uuid.uuid4()) for _ in texts]
+        if len(self.records):
+            self.vectors = np.concatenate([np.asarray(self.vectors), vectors])
+        else:
+            self.vectors = vectors
+        self.records.extend({"id": i, "text": t, "metadata": m} for i, t, m in zip(ids, texts, metadatas))
+        if persist:
+            self.persist()
+        # otherwise the new rows reach the ANN index on the next persist(); exact search meanwhile
+        return ids
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.add_vectors(self.embedding.embed_documents(texts), texts, metadatas, ids)
+
+    def delete(self, ids=None, **kwargs):
+        if not ids:
+            return False
+        drop = {str(i) for i in ids}
+        keep = [n for n, r in enumerate(self.records) if r["id"] not in drop]
+        if len(keep) == len(self.records):
+            return False
+        self.vectors = np.asarray(self.vectors)[keep] if keep else np.zeros((0, 0), dtype=np.float32)
+        self.records = [self.records[n] for n in keep]
+        self._ann = None  # rows were renumbered, so the graph is rebuilt
+        self.persist()
+        return True
+
+    def _update_ann(self):
+        """Brings the HNSW index up to date, inserting only rows it does not have yet."""
+        n = len(self.records)
+        if hnswlib is None or n < self.ann_threshold:
+            self._ann = None
+            return
+        if self._ann is None:
+            index = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+            index.init_index(max_elements=n, ef_construction=200, M=16)
+            index.set_ef(EF_SEARCH)
+            self._ann = index
+        start = self._ann.get_current_count()
+        if start == n:
+            return
+        if self._ann.get_max_elements() < n:
+            # grow geometrically so a stream of small batches does not resize every time
+            self._ann.resize_index(max(n, int(self._ann.get_max_elements() * 1.5)))
+        self._ann.add_items(np.asarray(self.vectors[start:]), np.arange(start, n))
+
+    # -- search ---------------------------------------------------------------
+
+    def search_by_vector(self, vector, k=4):
+        """[(row, score)] of the k most similar rows, best first."""
+        n = len(self.records)
+        if n == 0:
+            return []
+        k = min(k, n)
+        query = _normalize(vector).reshape(-1)
+        if self._ann is not None and self._ann.get_current_count() == n:
+            labels, distances = self._ann.knn_query(query, k=k)
+            # hnswlib's "ip" distance is 1 - dot product
+            return [(int(r), float(1 - d)) for r, d in zip(labels[0], distances[0])]
+        scores = self.vectors @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(r), float(scores[r])) for r in top]
+
+    def _to_document(self, row):
+        record = self.records[row]
+        return Document(page_content=record["text"], metadata=record["metadata"], id=record["id"])
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        hits = self.search_by_vector(self.embedding.embed_query(query), k)
+        return [(self._to_document(row), score) for row, score in hits]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [self._to_document(row) for row, _ in self.search_by_vector(embedding, k)]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        # cosine similarity in [-1, 1] -> relevance in [0, 1]
+        return lambda score: (score + 1) / 2
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, ids=None, path=None, **kwargs):
+        store = cls(embedding, path=path, **kwargs)
+        store.add_texts(texts, metadatas, ids)
+        return store
@@ -0,0 +1,180 @@
+"""
+Concurrent, batched Qdrant upserts over one pooled client.
+
+    writer = AsyncUpsertWriter(lambda: make_async_client(url, api_key), "pdf_docs", max_concurrency=4)
+    writer.write(docs, ids, vectors)   # returns as soon as the batch is queued
+    writer.flush()                     # wait for everything in flight
+    writer.close()
+
+The writer owns an asyncio loop on a background thread. Incoming points are
+cut into batches by estimated payload size (`max_batch_bytes`) instead of a
+fixed count, and up to `max_concurrency` upserts are in flight at once over
+the same client, so throughput is no longer one round trip per batch. A
+failed batch is retried with exponential backoff and jitter; if it still
+fails, the error is raised from the next `write()` / `flush()`.
+
+The sync client is cached per (url, api_key) and the writer builds its one
+async client on its own loop (asyncio/gRPC channels are bound to the loop
+that created them). Both use gRPC by default, which keeps a single
+multiplexed HTTP/2 connection open instead of reconnecting. For tests, the
+url ":memory:" gives a local in-memory Qdrant with the same API; there the
+writer goes through the shared sync client, because a second in-memory
+client would be a separate, empty store.
+"""
+
+import asyncio
+import json
+import random
+import threading
+from functools import lru_cache
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import PointStruct
+
+
+@lru_cache(maxsize=None)
+def get_client(url, api_key=None, prefer_grpc=True):
+    """Shared synchronous client (collection admin, LangChain retriever)."""
+    if url == ":memory:":
+        return QdrantClient(location=":memory:")
+    return QdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc)
+
+
+class SyncBackedClient:
+    """The async calls the writer needs, served by a sync client (for ":memory:")."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def upsert(self, **kwargs):
+        # the local in-memory store is not thread-safe, so no to_thread here
+        return self.client.upsert(**kwargs)
+
+    async def close(self):
+        pass  # the shared sync client stays open for its other users
+
+
+def make_async_client(url, api_key=None, prefer_grpc=True):
+    """Asyncio client for concurrent upserts; create it on the loop that uses it."""
+    if url == ":memory:":
+        return SyncBackedClient(get_client(url, api_key))
+    return AsyncQdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc)
+
+
+def point_bytes(point):
+    """Rough wire size of a point: 4 bytes per float plus the JSON payload."""
+    return 4 * len(point.vector) + len(json.dumps(point.payload, ensure_ascii=False, default=str))
+
+
+class AsyncUpsertWriter:
+    def __init__(self, client_factory, collection_name, max_concurrency=4, max_batch_bytes=4 * 2**20,
+                 max_batch_points=512, retries=5, base_delay=0.5,
+                 content_key="page_content", metadata_key="metadata"):
+        self.client = None
+        self.collection_name = collection_name
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_points = max_batch_points
+        self.retries = retries
+        self.base_delay = base_delay
+        self.content_key = content_key
+        self.metadata_key = metadata_key
+        self.upserted = 0
+        self.retried = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="qdrant-writer", daemon=True)
+        self._thread.start()
+        # bounds the batches queued or in flight, so callers feel backpressure
+        self._slots = threading.BoundedSemaphore(max_concurrency * 2)
+        asyncio.run_coroutine_threadsafe(self._setup(client_factory, max_concurrency), self._loop).result()
+        self._futures = []
+
+    async def _setup(self, client_factory, max_concurrency):
+        self.client = client_factory()
+        self._inflight = asyncio.Semaphore(max_concurrency)
+
+    # -- batching -------------------------------------------------------------
+
+    def batches(self, points):
+        """Splits points so every batch stays under the byte and count limits."""
+        batch, size = [], 0
+        for point in points:
+            n = point_bytes(point)
+            if batch and (size + n > self.max_batch_bytes or len(batch) >= self.max_batch_points):
+                yield batch
+                batch, size = [], 0
+            batch.append(point)
+            size += n
+        if batch:
+            yield batch
+
+    def to_points(self, docs, ids, vectors):
+        return [
+            PointStruct(id=i, vector=list(v), payload={
+                self.content_key: d.page_content,
+                self.metadata_key: d.metadata,
+            })
+            for d, i, v in zip(docs, ids, vectors)
+        ]
+
+    # -- async side -----------------------------------------------------------
+
+    async def _upsert(self, batch):
+        async with self._inflight:
+            for attempt in range(self.retries + 1):
+                try:
+                    await self.client.upsert(collection_name=self.collection_name, points=batch, wait=True)
+                    self.upserted += len(batch)
+                    return
+                except Exception:
+                    if attempt == self.retries:
+                        raise
+                    self.retried += 1
+                    delay = self.base_delay * 2 ** attempt
+                    await asyncio.sleep(delay + random.uniform(0, delay))
+
+    # -- caller side ----------------------------------------------------------
+
+    def _collect(self, wait):
+        """Drops finished batches (all of them when `wait`), raising the first failure."""
+        pending, error = [], None
+        for future in self._futures:
+            if wait or future.done():
+                error = error or future.exception()
+            else:
+                pending.append(future)
+        self._futures = pending
+        if error is not None:
+            raise error
+
+    def write_points(self, points):
+        for batch in self.batches(points):
+            self._collect(wait=False)
+            self._slots.acquire()
+            future = asyncio.run_coroutine_threadsafe(self._upsert(batch), self._loop)
+            future.add_done_callback(lambda _: self._slots.release())
+            self._futures.append(future)
+
+    def write(self, docs, ids, vectors):
+        """Queues LangChain documents with their ids and vectors for upsert."""
+        self.write_points(self.to_points(docs, ids, vectors))
+
+    def flush(self):
+        """Blocks until every queued batch is written, raising the first failure."""
+        self._collect(wait=True)
+
+    async def _close_client(self):
+        if self.client is not None:
+            await self.client.close()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            try:
+                # the client's channels belong to the writer loop, so close them there
+                asyncio.run_coroutine_threadsafe(self._close_client(), self._loop).result()
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
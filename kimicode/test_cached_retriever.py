@@ -0,0 +1,56 @@
+"""
+Level-1 (retrieval) cache hits through Answerer, offline: a fake LLM and
+fake embeddings over the local vector store.
+
+    cd kimicode && python -m pytest -q test_cached_retriever.py
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("langchain")
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import FakeListLLM
+
+import ingest_and_chat
+from ingest_manifest import IngestManifest
+from local_vectorstore import LocalVectorStore
+
+TEXTS = ["Chapter 1 is about cats.", "Chapter 2 is about dogs.", "Chapter 3 is about birds."]
+
+
+def make_answerer(tmp_path, monkeypatch, answer_cache):
+    monkeypatch.setattr(ingest_and_chat, "MANIFEST_DIR", str(tmp_path))
+    embeddings = DeterministicFakeEmbedding(size=16)
+    store = LocalVectorStore.from_texts(TEXTS, embeddings)
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    llm = FakeListLLM(responses=["an answer"] * 10)
+    return ingest_and_chat.Answerer(embeddings, manifest, store, llm=llm, answer_cache=answer_cache)
+
+
+def test_repeat_question_hits_level1_without_answer_cache(tmp_path, monkeypatch):
+    answerer = make_answerer(tmp_path, monkeypatch, answer_cache=False)
+    assert answerer("What is chapter 2 about?") == ("an answer", None)
+    assert answerer.chain.retriever.hits == 0
+    answerer("  what is Chapter 2 about ")
+    assert answerer.chain.retriever.hits == 1
+
+
+def test_level1_survives_restart(tmp_path, monkeypatch):
+    make_answerer(tmp_path, monkeypatch, answer_cache=False)("What is chapter 2 about?")
+    answerer = make_answerer(tmp_path, monkeypatch, answer_cache=False)
+    answerer("What is chapter 2 about?")
+    assert answerer.chain.retriever.hits == 1
+
+
+def test_retry_after_llm_failure_hits_level1(tmp_path, monkeypatch):
+    answerer = make_answerer(tmp_path, monkeypatch, answer_cache=True)
+    answerer.chain = ingest_and_chat.build_chain(answerer.vectorstore, answerer.manifest,
+                                                 FakeListLLM(responses=[]))  # errors when called
+    with pytest.raises(Exception):
+        answerer("What is chapter 3 about?")
+    retriever = answerer.chain.retriever
+    answerer.chain = None  # the next call builds a working chain over the same cache file
+    answerer("What is chapter 3 about?")
+    assert answerer.chain.retriever.hits == 1 and retriever.hits == 0
@@ -0,0 +1,263 @@
+"""
+One factory for the ReAct agents in this folder.
+
+    SPEC = AgentSpec(
+        name="crypto",
+        system_prompt="You are a helpful assistant ... {tools} ... {tool_names} ...",
+        tools=(ToolSpec("DuckDuckGo Search", duckduckgo_search, "Useful for ..."),),
+        temperature=0,
+        max_iterations=3,
+    )
+    agent_executor = get_agent(SPEC)          # built once per process, then reused
+    agent_executor.invoke({"input": "..."})
+    print(run_query(SPEC, "..."))             # the scripts' way: errors are printed, not raised
+
+    if __name__ == "__main__":                # --query/--stream/--trace for every script
+        run_cli(SPEC, ["default question"], description="...")
+
+Every agent used to build its own ChatGroq, prompt and AgentExecutor. Here
+they are cached instead:
+  - one pooled httpx client (sync + async) per provider, so every LLM built
+    for that provider reuses the same keep-alive connections and pays TLS once
+  - one chat model per (provider, model, temperature, streaming), answering
+    repeat deterministic prompts from llm_cache.py (LLM_CACHE=record/replay/off);
+    `streaming=True` specs get a model that emits on_llm_new_token callbacks
+  - one compiled prompt per system prompt
+  - one AgentExecutor per spec (specs are frozen, so they can be dict keys)
+
+A long-lived worker that answers many queries therefore only pays setup and
+connection costs for the first one. Every model of a provider also shares one
+rate limiter (GROQ_REQUESTS_PER_SECOND), so concurrent agents stay under the
+provider's quota together. LangChain and httpx are imported lazily, so
+importing a spec is cheap.
+"""
+
+import dataclasses
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+
+DEFAULT_MODEL = "llama3-8b-8192"
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    name: str
+    func: object  # callable taking the Action Input string
+    description: str
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    name: str
+    system_prompt: str  # must contain {tools} and {tool_names}
+    tools: tuple = ()
+    temperature: float = 0.0
+    max_iterations: int = 5
+    provider: str = "groq"
+    model: str = DEFAULT_MODEL
+    verbose: bool = True
+    streaming: bool = False  # token callbacks for streaming.py's handler
+
+
+# ---------------------------------------------------------
+# Pooled HTTP clients, one pair per provider
+# ---------------------------------------------------------
+POOL_LIMITS = {"max_connections": 20, "max_keepalive_connections": 10, "keepalive_expiry": 60.0}
+
+
+@lru_cache(maxsize=None)
+def http_clients(provider):
+    """(sync, async) httpx clients shared by every LLM of `provider`."""
+    import httpx
+
+    limits = httpx.Limits(**POOL_LIMITS)
+    timeout = httpx.Timeout(60.0, connect=10.0)
+    # the async client's connections belong to the event loop that first uses
+    # it; run all async agent calls of a process on one loop
+    return (httpx.Client(limits=limits, timeout=timeout),
+            httpx.AsyncClient(limits=limits, timeout=timeout))
+
+
+# requests per second allowed per provider, shared by every model and agent
+# of the process (0 = unlimited); see set_rate_limit()
+RATE_LIMITS = {"groq": float(os.getenv("GROQ_REQUESTS_PER_SECOND", "0"))}
+
+
+@lru_cache(maxsize=None)
+def rate_limiter(provider):
+    rps = RATE_LIMITS.get(provider, 0)
+    if not rps:
+        return None
+    from langchain_core.rate_limiters import InMemoryRateLimiter
+
+    return InMemoryRateLimiter(requests_per_second=rps, check_every_n_seconds=0.05,
+                               max_bucket_size=max(1, int(rps)))
+
+
+def set_rate_limit(provider, requests_per_second):
+    """Changes a provider's rate limit; models and executors are rebuilt on next use."""
+    RATE_LIMITS[provider] = requests_per_second
+    rate_limiter.cache_clear()
+    clear()
+
+
+def _groq(model, temperature, streaming=False):
+    from langchain_groq import ChatGroq
+    from llm_cache import langchain_cache
+
+    cache = langchain_cache(temperature)
+    # a replay run is served from the recording and needs no key
+    if not os.getenv("GROQ_API_KEY") and not (cache is not None and cache.store.mode == "replay"):
+        raise ValueError("GROQ_API_KEY not found in .env file")
+    sync_client, async_client = http_clients("groq")
+    return ChatGroq(temperature=temperature, model_name=model, rate_limiter=rate_limiter("groq"), cache=cache,
+                    streaming=streaming, http_client=sync_client, http_async_client=async_client)
+
+
+PROVIDERS = {
+    # provider: factory(model, temperature, streaming) -> LangChain chat model
+    "groq": _groq,
+}
+
+
+@lru_cache(maxsize=None)
+def get_llm(provider, model, temperature, streaming=False):
+    return PROVIDERS[provider](model, temperature, streaming)
+
+
+# ---------------------------------------------------------
+# Prompts, tools and executors
+# ---------------------------------------------------------
+@lru_cache(maxsize=None)
+def react_prompt(system_prompt):
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", "{input}"),
+        ("assistant", "{agent_scratchpad}"),  # the agent's intermediate steps
+    ])
+
+
+_search = None
+
+
+def duckduckgo_search(query):
+    """DuckDuckGo tool function; the underlying search wrapper is built once."""
+    global _search
+    if _search is None:
+        from langchain_community.tools import DuckDuckGoSearchRun
+        _search = DuckDuckGoSearchRun()
+    return _search.run(query)
+
+
+def build_tools(specs):
+    from langchain.agents import Tool
+
+    return [Tool(name=t.name, func=t.func, description=t.description) for t in specs]
+
+
+def build_agent(spec):
+    """Builds a fresh AgentExecutor for `spec` (shared LLM, prompt and HTTP pool)."""
+    from langchain.agents import AgentExecutor, create_react_agent
+
+    llm = get_llm(spec.provider, spec.model, spec.temperature, spec.streaming)
+    tools = build_tools(spec.tools)
+    agent = create_react_agent(llm=llm, tools=tools, prompt=react_prompt(spec.system_prompt))
+    return AgentExecutor(
+        agent=agent,
+        tools=tools,
+        verbose=spec.verbose,
+        handle_parsing_errors=True,  # handles LLM output that is not in the ReAct format
+        max_iterations=spec.max_iterations,
+    )
+
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def get_agent(spec):
+    """Cached AgentExecutor for `spec`; executors are stateless between invokes."""
+    with _lock:
+        if spec not in _executors:
+            _executors[spec] = build_agent(spec)
+        return _executors[spec]
+
+
+def clear():
+    """Drops cached executors and models (the HTTP pools stay open)."""
+    with _lock:
+        _executors.clear()
+    get_llm.cache_clear()
+    react_prompt.cache_clear()
+
+
+# ---------------------------------------------------------
+# Helpers for the agent scripts
+# ---------------------------------------------------------
+def get_executor(spec, **overrides):
+    """get_agent() with `overrides` applied to `spec`; prints why it failed and returns None."""
+    try:
+        return get_agent(dataclasses.replace(spec, **overrides))
+    except Exception as e:
+        # a missing GROQ_API_KEY lands here, the scripts report it instead of crashing
+        print(f"Error initializing the {spec.provider} model: {e}")
+        print(f"Please ensure the {spec.provider.upper()}_API_KEY is properly set in your .env file.")
+        return None
+
+
+def run_query(spec, query, callbacks=(), **overrides):
+    """Runs one query through the cached executor; returns its output, or None after printing the error."""
+    executor = get_executor(spec, **overrides)
+    if executor is None:
+        return None
+    try:
+        return executor.invoke({"input": query}, config={"callbacks": list(callbacks)})["output"]
+    except Exception as e:
+        print(f"\nAn error occurred during agent execution: {e}")
+        print("Please check the error message and ensure your environment is set up correctly.")
+        return None
+
+
+def run_cli(spec, default_queries, description=None, argv=None):
+    """Command line shared by the agent scripts: --query, --stream and --trace."""
+    import argparse
+
+    from streaming import streaming_handler
+    from tracing import tracing_handler
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--query", nargs="+", default=list(default_queries),
+                        help="one or more questions; the agent is built once and reused")
+    parser.add_argument("--stream", action="store_true", help="stream tokens and tool steps with latency metrics")
+    parser.add_argument("--trace", help="write per-step latency spans to this file (see tracing.py)")
+    parser.add_argument("--trace-format", choices=["jsonl", "otlp"], default="jsonl")
+    args = parser.parse_args(argv)
+
+    print(f"Attempting to create and run the {spec.name} agent with {spec.provider.capitalize()}...")
+    overrides = {"verbose": not args.stream, "streaming": args.stream}
+    if get_executor(spec, **overrides) is None:
+        print("Agent creation failed. Please check the error messages above.")
+        return 1
+
+    tracer = tracing_handler(args.trace, args.trace_format) if args.trace else None
+    for query in args.query:
+        print(f"\nRunning agent with query: '{query}'")
+        handler = streaming_handler() if args.stream else None
+        output = run_query(spec, query, [cb for cb in (handler, tracer) if cb], **overrides)
+        if output is None:
+            continue
+        if handler:
+            print(f"⏱️  {handler.report()}")
+        print("\n--- Agent Final Output ---")
+        print(output)
+        print("--------------------------")
+
+    if tracer:
+        tracer.close()
+        print(f"Traces written to {args.trace} (summary: python tracing.py {args.trace} --session {tracer.session})")
+    print("\nScript finished.")
+    return 0
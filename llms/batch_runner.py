@@ -0,0 +1,153 @@
+"""
+Run many queries through the agents concurrently.
+
+    python batch_runner.py queries.jsonl --out results.jsonl --concurrency 16
+    cat questions.txt | python batch_runner.py - --agent crypto --rps 0.5
+
+Input is JSONL, one query per line: {"id": ..., "agent": "crypto", "input": "..."}
+("id" and "agent" are optional; `--agent` is the default agent). A plain-text
+line is taken as the input itself.
+
+Up to `--concurrency` queries run at once through `AgentExecutor.ainvoke` on
+one event loop. LLM calls from every query go through the provider's shared
+rate limiter (`--rps`, default GROQ_REQUESTS_PER_SECOND), so the limit holds
+for the batch as a whole. Sync tools run in the loop's thread pool, and the
+executor gathers the tools of several Actions in one step concurrently. Each
+result is written as a JSON line as soon as its query finishes (so output
+order is completion order; use "id" to match them up), and the input is read
+lazily, so memory stays flat on large batches. `--trace` records the spans of
+every run (tracing.py) and prints where this batch's time went at the end
+(spans of earlier batches in the same file are left out of the report).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import importlib
+import json
+import sys
+import time
+
+from dotenv import load_dotenv
+
+import agent_factory
+import tracing
+
+load_dotenv()
+
+AGENTS = {
+    # name: (module, spec) - the scripts in this folder
+    "crypto": ("groq_agent", "CRYPTO_AGENT"),
+    "weather": ("copy_code", "WEATHER_AGENT"),
+    "tweets": ("tweet_groq", "TWEET_AGENT"),
+    "stackoverflow": ("stack_OVF", "STACKOVERFLOW_AGENT"),
+}
+
+
+def load_spec(name, verbose=False):
+    module, attr = AGENTS[name]
+    spec = getattr(importlib.import_module(module), attr)
+    return dataclasses.replace(spec, verbose=verbose)
+
+
+def parse_line(line, n, default_agent):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        item = json.loads(line)
+    except json.JSONDecodeError:
+        item = line
+    if not isinstance(item, dict):
+        item = {"input": str(item)}
+    item.setdefault("id", n)
+    item.setdefault("agent", default_agent)
+    return item
+
+
+async def run_one(item, verbose, callbacks=()):
+    start = time.perf_counter()
+    result = {"id": item["id"], "agent": item["agent"], "input": item["input"]}
+    try:
+        if item["agent"] not in AGENTS:
+            raise ValueError(f"unknown agent {item['agent']!r} (choose from {', '.join(AGENTS)})")
+        executor = agent_factory.get_agent(load_spec(item["agent"], verbose))
+        output = await executor.ainvoke({"input": item["input"]}, config={"callbacks": list(callbacks)})
+        result.update(ok=True, output=output["output"])
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+async def run_batch(lines, out, default_agent="crypto", concurrency=8, verbose=False, callbacks=()):
+    """Runs every query from `lines`, writing one JSON line per result to `out`; returns stats."""
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    stats = {"ok": 0, "failed": 0}
+    loop = asyncio.get_running_loop()
+
+    async def produce():
+        it = iter(lines)
+        n = 0
+        # stdin may block, so lines are read off the event loop
+        while (line := await loop.run_in_executor(None, next, it, None)) is not None:
+            item = parse_line(line, n, default_agent)
+            if item is not None:
+                await queue.put(item)
+                n += 1
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def work():
+        while (item := await queue.get()) is not None:
+            result = await run_one(item, verbose, callbacks)
+            stats["ok" if result["ok"] else "failed"] += 1
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+
+    await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a batch of queries through the llms agents")
+    parser.add_argument("input", help="JSONL (or plain text) file of queries, '-' for stdin")
+    parser.add_argument("--out", help="results JSONL (default: stdout)")
+    parser.add_argument("--agent", default="crypto", choices=sorted(AGENTS), help="agent for lines without one")
+    parser.add_argument("--concurrency", type=int, default=8, help="queries in flight at once")
+    parser.add_argument("--rps", type=float, help="LLM requests per second for the provider (default: env)")
+    parser.add_argument("--verbose", action="store_true", help="print every agent's Thought/Action trace")
+    parser.add_argument("--trace", help="write per-step latency spans of every run to this file")
+    parser.add_argument("--trace-format", choices=["jsonl", "otlp"], default="jsonl")
+    args = parser.parse_args(argv)
+
+    if args.rps is not None:
+        agent_factory.set_rate_limit("groq", args.rps)
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    tracer = tracing.tracing_handler(args.trace, args.trace_format) if args.trace else None
+    start = time.perf_counter()
+    try:
+        stats = asyncio.run(run_batch(src, out, args.agent, args.concurrency, args.verbose,
+                                      [tracer] if tracer else []))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+        if tracer:
+            tracer.close()
+    elapsed = time.perf_counter() - start
+    done = stats["ok"] + stats["failed"]
+    print(f"✅ {done} queries ({stats['failed']} failed) in {elapsed:.1f}s "
+          f"- {done / max(elapsed, 1e-9):.2f} queries/s", file=sys.stderr)
+    if tracer and args.trace_format == "jsonl":
+        with contextlib.redirect_stdout(sys.stderr):
+            tracing.print_report(tracing.load_spans([args.trace], session=tracer.session))
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Record/replay cache for LLM calls (Groq SDK, ChatGroq, Gemini).
+
+    LLM_CACHE=auto    (default) serve deterministic (temperature 0) calls from
+                      the cache, call the API on a miss and store the result
+    LLM_CACHE=record  always call the API and store every response, whatever
+                      the temperature (refreshes a recording)
+    LLM_CACHE=replay  never call the API: every call must be in the cache,
+                      a miss raises CacheMiss - runs fully offline
+    LLM_CACHE=off     no caching
+
+Responses are keyed on a hash of (provider, model, params, messages) and kept
+in one SQLite file (LLM_CACHE_PATH, default .llm_cache.sqlite next to this
+file) with LRU eviction past `max_entries`. Two ways in:
+
+    chat = ChatGroq(..., cache=langchain_cache(temperature))   # LangChain models
+    completion = default_store().call("groq", kwargs, client.chat.completions.create,
+                                      dump=lambda r: r.model_dump(), load=ChatCompletion.model_validate)
+
+Sampling with temperature > 0 is only cached in record/replay mode, so normal
+runs keep their variety while tests and benchmarks can pin every response.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+DEFAULT_PATH = os.getenv("LLM_CACHE_PATH",
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache.sqlite"))
+MODES = ("auto", "record", "replay", "off")
+
+
+class CacheMiss(RuntimeError):
+    """Raised in replay mode for a call that was never recorded."""
+
+
+def make_key(provider, model, params, messages):
+    blob = json.dumps([provider, model, params, messages], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, path=DEFAULT_PATH, mode=None, max_entries=50_000):
+        self.mode = mode or os.getenv("LLM_CACHE", "auto")
+        if self.mode not in MODES:
+            raise ValueError(f"LLM_CACHE must be one of {MODES}, got {self.mode!r}")
+        self.max_entries = max_entries
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses "
+            "(key TEXT PRIMARY KEY, provider TEXT, response TEXT, created REAL, last_used REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS llm_responses_last_used ON llm_responses(last_used)")
+
+    def caches(self, temperature):
+        """Whether a call at `temperature` goes through the cache in this mode."""
+        if self.mode == "off":
+            return False
+        return self.mode != "auto" or not temperature
+
+    def get(self, key):
+        """Cached response for `key` (None on a miss; CacheMiss in replay mode)."""
+        if self.mode == "record":
+            return None
+        with self._lock:
+            row = self.db.execute("SELECT response FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                self.db.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (time.time(), key))
+                self.db.commit()
+                return row[0]
+            self.misses += 1
+        if self.mode == "replay":
+            raise CacheMiss(f"LLM_CACHE=replay and no recorded response for {key[:12]}")
+        return None
+
+    def put(self, key, provider, response):
+        now = time.time()
+        with self._lock:
+            self.db.execute("INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?)",
+                            (key, provider, response, now, now))
+            count = self.db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            if count > self.max_entries:
+                self.db.execute(
+                    "DELETE FROM llm_responses WHERE key IN "
+                    "(SELECT key FROM llm_responses ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self.db.commit()
+
+    def call(self, provider, kwargs, fn, dump=lambda r: r, load=lambda d: d):
+        """
+        Runs `fn(**kwargs)` through the cache. `kwargs` must hold "model" and
+        "messages"; every other argument counts as a parameter. `dump` turns
+        the response into JSON-able data and `load` turns it back.
+        """
+        if not self.caches(kwargs.get("temperature", 1.0)):
+            return fn(**kwargs)
+        params = {k: v for k, v in kwargs.items() if k not in ("model", "messages")}
+        key = make_key(provider, kwargs.get("model"), params, kwargs.get("messages"))
+        cached = self.get(key)
+        if cached is not None:
+            return load(json.loads(cached))
+        response = fn(**kwargs)
+        self.put(key, provider, json.dumps(dump(response), ensure_ascii=False))
+        return response
+
+    def clear(self):
+        with self._lock:
+            self.db.execute("DELETE FROM llm_responses")
+            self.db.commit()
+
+    def stats(self):
+        with self._lock:
+            rows = self.db.execute("SELECT provider, COUNT(*) FROM llm_responses GROUP BY provider").fetchall()
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses, "entries": dict(rows)}
+
+
+@lru_cache(maxsize=None)
+def default_store():
+    return LLMResponseCache()
+
+
+# ---------------------------------------------------------
+# LangChain adapter (pass as a chat model's `cache=`)
+# ---------------------------------------------------------
+@lru_cache(maxsize=None)
+def _langchain_cache_class():
+    from langchain_core.caches import BaseCache
+    from langchain_core.load import dumps, loads
+
+    class LangChainLLMCache(BaseCache):
+        """BaseCache over LLMResponseCache; `llm_string` carries provider, model and params."""
+
+        def __init__(self, store):
+            self.store = store
+
+        def lookup(self, prompt, llm_string):
+            cached = self.store.get(make_key("langchain", None, llm_string, prompt))
+            return None if cached is None else loads(cached)
+
+        def update(self, prompt, llm_string, return_val):
+            self.store.put(make_key("langchain", None, llm_string, prompt), "langchain", dumps(return_val))
+
+        def clear(self, **kwargs):
+            self.store.clear()
+
+    return LangChainLLMCache
+
+
+def langchain_cache(temperature=0.0, store=None):
+    """Cache for a LangChain chat model at `temperature`, or None when the mode skips it."""
+    store = store or default_store()
+    if not store.caches(temperature):
+        return None
+    return _langchain_cache_class()(store)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear the LLM response cache")
+    parser.add_argument("--clear", action="store_true", help="drop every recorded response")
+    args = parser.parse_args()
+
+    store = LLMResponseCache(mode="auto")
+    if args.clear:
+        store.clear()
+        print(f"🧹 Cleared {DEFAULT_PATH}")
+    print(store.stats())
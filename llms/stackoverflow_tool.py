@@ -0,0 +1,210 @@
+"""
+StackOverflow search tool: pooled, parallel and returning real answers.
+
+    search_stackoverflow("python requests get timeout")
+    python stackoverflow_tool.py "python requests get timeout" --base-url http://127.0.0.1:8000
+
+One search costs one results page plus the top `num_results` question pages,
+fetched concurrently, and the tool returns each question's accepted answer
+(or its top-voted one when none is accepted). The agent gets the solution in
+the first Observation instead of snippets it has to search again for.
+
+  - every request goes through one keep-alive `requests.Session` with a
+    connection pool and retry/backoff on 429/5xx
+  - pages are parsed with lxml when it is installed, and a SoupStrainer
+    keeps only the result / question / answer nodes, so the rest of the page
+    (navigation, sidebars, comments, scripts) is never built into a tree
+  - question pages share a total time budget; pages that miss it are left
+    out instead of stalling the agent
+
+`base_url` (or STACKOVERFLOW_URL) points the tool at any server with the
+same HTML, e.g. a local http.server serving recorded pages for tests.
+Progress goes to stderr, so batch_runner's JSONL on stdout stays clean, and
+`is_success` tells a cache which results are worth keeping.
+"""
+
+import argparse
+import os
+import sys
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+
+BASE_URL = os.getenv("STACKOVERFLOW_URL", "https://stackoverflow.com")
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+MAX_ANSWER_CHARS = 1500
+NO_RESULTS = "No relevant StackOverflow results found or parsed for your query."
+
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stackoverflow")
+
+
+@lru_cache(maxsize=None)
+def get_session(pool_size=8):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def _parser():
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+def _soup(html, strainer):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, _parser(), parse_only=strainer)
+
+
+def _text(node, limit=None):
+    text = node.get_text("\n", strip=True) if node is not None else ""
+    if limit and len(text) > limit:
+        text = text[:limit].rstrip() + " ..."
+    return text
+
+
+# ---------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------
+def parse_search(html, base_url, num_results):
+    """Returns [{title, link, stats, snippet}] for the top results of a search page."""
+    from bs4 import SoupStrainer
+
+    soup = _soup(html, SoupStrainer("div", class_=["s-post-summary", "search-result"]))
+    results = []
+    for item in soup.find_all("div", class_=["s-post-summary", "search-result"], limit=num_results):
+        title_tag = item.select_one("h3 a") or item.select_one("div.result-link a")
+        if title_tag is None:
+            continue
+        link = urllib.parse.urljoin(base_url, title_tag.get("href", ""))
+        stats = item.select_one(".s-post-summary--stats-item__emphasized") or item.select_one(
+            ".s-post-summary--stats-item")
+        results.append({
+            "title": _text(title_tag),
+            "link": link,
+            "stats": " ".join(_text(stats).split()) if stats is not None else "Stats N/A",
+            "snippet": _text(item.select_one(".s-post-summary--content-excerpt")) or "No snippet available.",
+        })
+    return results
+
+
+def parse_question(html):
+    """Returns {question, answer, accepted, score} from a question page."""
+    from bs4 import SoupStrainer
+
+    soup = _soup(html, SoupStrainer("div", class_=["question", "answer"]))
+    question = soup.find("div", class_="question")
+    answers = soup.find_all("div", class_="answer")
+    accepted = [a for a in answers if "accepted-answer" in a.get("class", [])
+                or a.get("itemprop") == "acceptedAnswer"]
+
+    def score(node):
+        try:
+            return int(node.get("data-score", 0))
+        except ValueError:
+            return 0
+
+    best = accepted[0] if accepted else max(answers, key=score, default=None)
+
+    def body(node, limit):
+        if node is None:
+            return ""
+        return _text(node.select_one(".js-post-body") or node.select_one(".s-prose") or node, limit)
+
+    return {
+        "question": body(question, 400),
+        "answer": body(best, MAX_ANSWER_CHARS),
+        "accepted": bool(accepted),
+        "score": score(best) if best is not None else None,
+    }
+
+
+# ---------------------------------------------------------
+# Fetching
+# ---------------------------------------------------------
+def fetch(url, timeout):
+    response = get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def search_stackoverflow(query, num_results=3, budget=8.0, base_url=None):
+    """
+    Searches StackOverflow and returns a formatted string with, for each of
+    the top `num_results` questions, its title, link, stats and best answer.
+    Everything (search page included) has to finish within `budget` seconds.
+    """
+    import requests
+
+    base_url = (base_url or BASE_URL).rstrip("/")
+    deadline = time.monotonic() + budget
+    search_url = f"{base_url}/search?q={urllib.parse.quote_plus(query)}"
+    try:
+        print(f"Tool: Searching StackOverflow with URL: {search_url}", file=sys.stderr)
+        results = parse_search(fetch(search_url, timeout=budget), base_url, num_results)
+        if not results:
+            return NO_RESULTS
+
+        # question pages in parallel; whatever is not back by the deadline is skipped
+        futures = {_pool.submit(fetch, r["link"], max(0.5, deadline - time.monotonic())): r for r in results}
+        done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for future in done:
+            if future.exception() is not None:
+                continue  # that question falls back to its search snippet
+            try:
+                futures[future].update(parse_question(future.result()))
+            except Exception:
+                continue
+
+        summary = []
+        for r in results:
+            lines = [f"Title: {r['title']}", f"Link: {r['link']}", f"Stats: {r['stats']}"]
+            if r.get("answer"):
+                label = "Accepted answer" if r["accepted"] else f"Top answer (score {r['score']})"
+                lines += [f"Question: {r['question']}", f"{label}:\n{r['answer']}"]
+            else:
+                lines.append(f"Snippet: {r['snippet']}")
+            summary.append("\n".join(lines) + "\n---")
+        return "\n".join(summary)
+
+    except requests.exceptions.Timeout:
+        return "Error: The request to StackOverflow timed out."
+    except requests.exceptions.HTTPError as e:
+        return f"Error: HTTP error occurred while searching StackOverflow: {e}"
+    except requests.exceptions.RequestException as e:
+        return f"Error: A network problem occurred during StackOverflow search: {e}"
+    except Exception as e:
+        # Catch any other exceptions during parsing
+        return f"Error: An unexpected error occurred while parsing StackOverflow results: {e}"
+
+
+def is_success(result):
+    """True for a result listing questions - not an error, not NO_RESULTS (e.g. a blocked page)."""
+    return isinstance(result, str) and result.startswith("Title: ")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search StackOverflow the way the coding agent does")
+    parser.add_argument("query")
+    parser.add_argument("--num-results", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=8.0, help="total seconds for all requests")
+    parser.add_argument("--base-url", help="e.g. a local server with recorded pages")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    print(search_stackoverflow(args.query, args.num_results, args.budget, args.base_url))
+    print(f"⏱️  {time.perf_counter() - start:.2f}s")
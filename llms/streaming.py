@@ -0,0 +1,199 @@
+"""
+Token streaming with latency metrics, for the Groq SDK and the LangChain agents.
+
+    text, metrics = stream_chat(client.chat.completions.create, model=..., messages=[...])
+    print(metrics.summary())   # ttft 180 ms | 412 tokens in 3.9 s (105.6 tok/s) | gap p50 8 ms p99 31 ms
+
+    handler = streaming_handler()
+    agent_executor.invoke({"input": query}, config={"callbacks": [handler]})
+    print(handler.report())
+
+Tokens are written (to stdout, or to any `on_token` callback) the moment they
+arrive, so a long answer starts showing after the time-to-first-token
+instead of after the whole completion. Every LLM call records:
+  ttft_ms      request sent -> first content token
+  gap_p50/p99  inter-token latency
+  tokens       completion tokens (the API's usage count when it sends one)
+  total_s      request sent -> last token
+
+For agents, the handler also prints each tool call and a short Observation,
+and keeps one StreamMetrics per LLM call of the run. Token events only come
+from models built with `streaming=True` (AgentSpec(streaming=True), which
+`--stream` sets); a call that ends without any is flagged on stderr, and
+
+    python streaming.py "Count to ten"     # live check against Groq, cache off
+
+fails unless real tokens reach the handler. LangChain is only imported when
+a handler is created, so the SDK path works without it.
+"""
+
+import sys
+import time
+from functools import lru_cache
+
+
+def print_token(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class StreamMetrics:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first = None
+        self.last = None
+        self.gaps = []
+        self.chunks = 0
+        self.usage_tokens = None  # completion tokens reported by the API, if any
+
+    def token(self):
+        now = time.perf_counter()
+        if self.first is None:
+            self.first = now
+        else:
+            self.gaps.append(now - self.last)
+        self.last = now
+        self.chunks += 1
+
+    @property
+    def tokens(self):
+        return self.usage_tokens if self.usage_tokens is not None else self.chunks
+
+    def as_dict(self):
+        end = self.last or time.perf_counter()
+        total = end - self.start
+        return {
+            "ttft_ms": round((self.first - self.start) * 1000, 1) if self.first else None,
+            "gap_p50_ms": round(_percentile(self.gaps, 0.50) * 1000, 1),
+            "gap_p99_ms": round(_percentile(self.gaps, 0.99) * 1000, 1),
+            "tokens": self.tokens,
+            "total_s": round(total, 3),
+            "tokens_per_s": round(self.tokens / total, 1) if total > 0 else 0.0,
+        }
+
+    def summary(self):
+        m = self.as_dict()
+        ttft = f"{m['ttft_ms']:.0f} ms" if m["ttft_ms"] is not None else "n/a"
+        return (f"ttft {ttft} | {m['tokens']} tokens in {m['total_s']:.1f} s ({m['tokens_per_s']} tok/s) "
+                f"| gap p50 {m['gap_p50_ms']:.0f} ms p99 {m['gap_p99_ms']:.0f} ms")
+
+
+def stream_chat(create, on_token=print_token, **kwargs):
+    """Streams a Groq/OpenAI-style chat completion; returns (text, StreamMetrics)."""
+    metrics = StreamMetrics()
+    parts = []
+    for chunk in create(stream=True, **kwargs):
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                metrics.token()
+                parts.append(delta)
+                on_token(delta)
+        # Groq sends usage on the final chunk (x_groq.usage), OpenAI in chunk.usage
+        usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or getattr(chunk, "usage", None)
+        if usage is not None and getattr(usage, "completion_tokens", None):
+            metrics.usage_tokens = usage.completion_tokens
+    return "".join(parts), metrics
+
+
+# ---------------------------------------------------------
+# LangChain callback handler for the agents
+# ---------------------------------------------------------
+@lru_cache(maxsize=None)
+def _handler_class():
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class StreamingCallbackHandler(BaseCallbackHandler):
+        """Writes LLM tokens and tool steps as they happen and times every LLM call."""
+
+        def __init__(self, on_token=print_token, observation_chars=300):
+            self.on_token = on_token
+            self.observation_chars = observation_chars
+            self.calls = []  # StreamMetrics per finished LLM call
+            self._open = {}  # run_id -> StreamMetrics
+
+        def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+            self._open[run_id] = StreamMetrics()
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+            self._open[run_id] = StreamMetrics()
+
+        def on_llm_new_token(self, token, *, run_id, **kwargs):
+            if token:
+                self._open.setdefault(run_id, StreamMetrics()).token()
+                self.on_token(token)
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            metrics = self._open.pop(run_id, None)
+            if metrics is None:
+                return
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            if usage.get("completion_tokens"):
+                metrics.usage_tokens = usage["completion_tokens"]
+            if metrics.chunks == 0 and response.generations and response.generations[0]:
+                # answered without streaming (e.g. from the LLM cache): show it whole
+                self.on_token(response.generations[0][0].text)
+                print("⚠️  no token events for this call (LLM cache hit, or a model built "
+                      "without streaming=True)", file=sys.stderr)
+            self.calls.append(metrics)
+            self.on_token("\n")
+            print(f"⏱️  {metrics.summary()}", file=sys.stderr)
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            self._open.pop(run_id, None)
+
+        def on_tool_start(self, serialized, input_str, **kwargs):
+            self.on_token(f"🔧 {serialized.get('name', 'tool')}({input_str!r})\n")
+
+        def on_tool_end(self, output, **kwargs):
+            text = str(output)
+            if len(text) > self.observation_chars:
+                text = text[:self.observation_chars] + " ..."
+            self.on_token(f"👀 {text}\n")
+
+        def report(self):
+            """Per-run totals: LLM calls, summed tokens, first TTFT and worst gap."""
+            if not self.calls:
+                return "no LLM calls recorded"
+            stats = [m.as_dict() for m in self.calls]
+            first_ttft = stats[0]["ttft_ms"]
+            streamed = sum(1 for m in self.calls if m.chunks)
+            return (f"{len(stats)} LLM calls ({streamed} streamed) | {sum(s['tokens'] for s in stats)} tokens | "
+                    f"{sum(s['total_s'] for s in stats):.1f} s in LLM | first ttft "
+                    f"{f'{first_ttft:.0f} ms' if first_ttft is not None else 'n/a'} | "
+                    f"worst gap p99 {max(s['gap_p99_ms'] for s in stats):.0f} ms")
+
+    return StreamingCallbackHandler
+
+
+def streaming_handler(on_token=print_token, observation_chars=300):
+    return _handler_class()(on_token, observation_chars)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Check that a streaming Groq model sends token events")
+    parser.add_argument("prompt", nargs="?", default="Count from one to ten in words.")
+    args = parser.parse_args()
+
+    os.environ["LLM_CACHE"] = "off"  # a cached answer arrives whole, without token events
+    from dotenv import load_dotenv
+    import agent_factory
+
+    load_dotenv()
+    handler = streaming_handler()
+    llm = agent_factory.get_llm("groq", agent_factory.DEFAULT_MODEL, 0.0, streaming=True)
+    llm.invoke(args.prompt, config={"callbacks": [handler]})
+    print(f"⏱️  {handler.report()}")
+    if not handler.calls or handler.calls[0].chunks < 2:
+        sys.exit("❌ no token events reached the handler")
+    print(f"✅ {handler.calls[0].chunks} token events, ttft {handler.calls[0].as_dict()['ttft_ms']:.0f} ms")
@@ -0,0 +1,179 @@
+"""
+TTL cache for agent tool calls (DuckDuckGo, StackOverflow, ...).
+
+    search = cached_tool(duckduckgo_search, "duckduckgo", ttl=60)
+    ToolSpec("DuckDuckGo Search", search, "...")
+
+Results are keyed on (tool name, normalized input): NFC, collapsed
+whitespace, lower case and without the quotes ReAct models like to put
+around an Action Input. Two tiers sit behind every cached tool:
+  - memory  an LRU of the most recent `max_entries` results
+  - disk    an optional SQLite file (TOOL_CACHE_PATH, "" turns it off)
+            shared across processes, with LRU eviction past `max_disk_entries`
+
+Entries store when they were fetched, not when they expire, so each wrapper
+applies its own TTL: the crypto agent accepts a 60 s old search result that
+the news agent would also reuse for an hour. Concurrent identical calls are
+single-flighted: the first one hits the network, the others wait for its
+result. Results that look like errors ("Error: ...") are not cached; a tool
+can pass its own `should_cache` test to keep only real successes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+
+DEFAULT_PATH = os.getenv("TOOL_CACHE_PATH",
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tool_cache.sqlite"))
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_input(text):
+    text = unicodedata.normalize("NFC", str(text))
+    return _WHITESPACE.sub(" ", text).strip().strip("\"'`").strip().lower()
+
+
+def is_error(result):
+    return isinstance(result, str) and result.lstrip().lower().startswith("error")
+
+
+class ToolCache:
+    def __init__(self, path=DEFAULT_PATH, max_entries=2048, max_disk_entries=100_000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()  # key -> (fetched_at, value)
+        self.hits = self.misses = self.coalesced = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Future of the call currently fetching it
+        self.db = None
+        if path:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS tool_results "
+                "(key TEXT PRIMARY KEY, value TEXT, fetched_at REAL, last_used REAL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS tool_results_last_used ON tool_results(last_used)")
+
+    @staticmethod
+    def key(name, tool_input):
+        return hashlib.sha256(f"{name}\0{normalize_input(tool_input)}".encode("utf-8")).hexdigest()
+
+    # -- tiers (call with the lock held) --------------------------------------
+
+    def _lookup(self, key, ttl):
+        now = time.time()
+        entry = self.memory.get(key)
+        if entry is None and self.db is not None:
+            row = self.db.execute("SELECT fetched_at, value FROM tool_results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = (row[0], json.loads(row[1]))
+                self._remember(key, entry)
+        if entry is None or now - entry[0] > ttl:
+            return None
+        self.memory.move_to_end(key)
+        if self.db is not None:
+            self.db.execute("UPDATE tool_results SET last_used = ? WHERE key = ?", (now, key))
+            self.db.commit()
+        return entry
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _store(self, key, value):
+        now = time.time()
+        self._remember(key, (now, value))
+        if self.db is None:
+            return
+        self.db.execute("INSERT OR REPLACE INTO tool_results VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(value), now, now))
+        count = self.db.execute("SELECT COUNT(*) FROM tool_results").fetchone()[0]
+        if count > self.max_disk_entries:
+            self.db.execute(
+                "DELETE FROM tool_results WHERE key IN "
+                "(SELECT key FROM tool_results ORDER BY last_used LIMIT ?)",
+                (count - self.max_disk_entries,),
+            )
+        self.db.commit()
+
+    # -- single-flight call ---------------------------------------------------
+
+    def call(self, name, tool_input, fn, ttl, should_cache=lambda r: not is_error(r)):
+        """Returns a cached result younger than `ttl` seconds, or fetches it once via `fn(tool_input)`."""
+        key = self.key(name, tool_input)
+        with self._lock:
+            entry = self._lookup(key, ttl)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = fn(tool_input)
+            if should_cache(value):
+                with self._lock:
+                    self._store(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                "memory_entries": len(self.memory)}
+
+
+@lru_cache(maxsize=None)
+def default_cache():
+    return ToolCache()
+
+
+class CachedTool:
+    """Callable drop-in for a tool function, answering from `cache` for `ttl` seconds."""
+
+    def __init__(self, func, name, ttl, cache=None, should_cache=None):
+        self.func = func
+        self.name = name
+        self.ttl = ttl
+        self._cache = cache
+        self.should_cache = should_cache or (lambda r: not is_error(r))
+
+    @property
+    def cache(self):
+        # opened on first use, so defining a spec does not touch the disk
+        if self._cache is None:
+            self._cache = default_cache()
+        return self._cache
+
+    def __call__(self, tool_input):
+        return self.cache.call(self.name, tool_input, self.func, self.ttl, self.should_cache)
+
+    def __repr__(self):
+        return f"CachedTool({self.name!r}, ttl={self.ttl})"
+
+
+def cached_tool(func, name, ttl, cache=None, should_cache=None):
+    return CachedTool(func, name, ttl, cache, should_cache)
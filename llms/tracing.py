@@ -0,0 +1,362 @@
+"""
+Per-step latency tracing for AgentExecutor runs.
+
+    tracer = tracing_handler("traces.jsonl")            # or fmt="otlp"
+    agent_executor.invoke({"input": query}, config={"callbacks": [tracer]})
+    tracer.close()
+
+    python tracing.py traces.jsonl                      # where did the time go?
+    python tracing.py traces.jsonl --session <id>       # only one process's runs
+
+Every agent run becomes a tree of spans:
+
+    run          AgentExecutor.invoke, from input to final answer
+      iteration  one ReAct step: the planning LLM call plus the tool it chose
+        llm      one chat completion (model, prompt/completion tokens)
+        tool     one tool call (name, input, bytes returned)
+        parse_error  a `handle_parsing_errors` retry (LangChain's _Exception tool)
+
+Spans are written when they end, one JSON object per line (session,
+trace_id, span_id, parent_id, kind, name, start/end in ns, duration_ms,
+status, attributes). Files are appended to, so every handler tags its spans
+with its own `session` id and a report can be limited to one session. With
+fmt="otlp" each line is an OTLP/JSON ExportTraceServiceRequest
+instead, the format the OpenTelemetry collector's file exporter writes, so the
+traces can be loaded into Jaeger/Tempo without the OpenTelemetry SDK here.
+
+The report reads the JSONL spans of any number of runs and breaks total run
+time down into LLM, each tool, parse retries and agent overhead (prompt
+formatting, output parsing) with call counts and p50/p95 latencies.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from functools import lru_cache
+
+MAX_ATTR_CHARS = 500
+
+
+def _short(value):
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= MAX_ATTR_CHARS else text[:MAX_ATTR_CHARS] + " ..."
+
+
+# ---------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------
+class JsonlSpanExporter:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def format(self, span):
+        return span
+
+    def export(self, span):
+        line = json.dumps(self.format(span), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class OtlpFileExporter(JsonlSpanExporter):
+    """One OTLP/JSON ExportTraceServiceRequest per line (OpenTelemetry file exporter layout)."""
+
+    service_name = "llms-agents"
+
+    @staticmethod
+    def _value(v):
+        if isinstance(v, bool):
+            return {"boolValue": v}
+        if isinstance(v, int):
+            return {"intValue": str(v)}
+        if isinstance(v, float):
+            return {"doubleValue": v}
+        return {"stringValue": str(v)}
+
+    def format(self, span):
+        attributes = dict(span["attributes"], **{"span.kind": span["kind"]})
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}},
+                {"key": "service.instance.id", "value": {"stringValue": span["session"]}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "llms.tracing"},
+                "spans": [{
+                    "traceId": span["trace_id"],
+                    "spanId": span["span_id"],
+                    "parentSpanId": span["parent_id"] or "",
+                    "name": span["name"],
+                    "kind": 1,  # SPAN_KIND_INTERNAL
+                    "startTimeUnixNano": str(span["start_ns"]),
+                    "endTimeUnixNano": str(span["end_ns"]),
+                    "attributes": [{"key": k, "value": self._value(v)} for k, v in attributes.items()],
+                    "status": {"code": 2 if span["status"] == "error" else 1},
+                }],
+            }],
+        }]}
+
+
+EXPORTERS = {"jsonl": JsonlSpanExporter, "otlp": OtlpFileExporter}
+
+
+# ---------------------------------------------------------
+# Callback handler
+# ---------------------------------------------------------
+@lru_cache(maxsize=None)
+def _handler_class():
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class TracingCallbackHandler(BaseCallbackHandler):
+        """Turns LangChain callbacks into nested run/iteration/llm/tool spans."""
+
+        run_inline = True  # keep callback order under ainvoke
+
+        def __init__(self, exporter):
+            self.exporter = exporter
+            self.session = uuid.uuid4().hex[:12]  # tags this handler's spans in a shared file
+            self._lock = threading.Lock()
+            self._spans = {}      # run_id -> open span
+            self._anchor = {}     # run_id -> span that LLM/tool spans below it attach to
+            self._roots = {}      # AgentExecutor run_id -> {"span", "iteration", "count"}
+
+        # -- span bookkeeping (lock held) ------------------------------------
+
+        def _open(self, kind, name, parent, attributes=None, key=None):
+            span = {
+                "session": self.session,
+                "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+                "span_id": uuid.uuid4().hex[:16],
+                "parent_id": parent["span_id"] if parent else None,
+                "kind": kind,
+                "name": name,
+                "start_ns": time.time_ns(),
+                "status": "ok",
+                "attributes": dict(attributes or {}),
+            }
+            if key is not None:
+                self._spans[key] = span
+            return span
+
+        def _close(self, span, status=None, **attributes):
+            span["end_ns"] = time.time_ns()
+            span["duration_ms"] = round((span["end_ns"] - span["start_ns"]) / 1e6, 3)
+            if status:
+                span["status"] = status
+            span["attributes"].update(attributes)
+            self.exporter.export(span)
+
+        def _parent_for(self, parent_run_id):
+            root = self._roots.get(parent_run_id)
+            if root is not None:  # called straight from the executor: tools
+                return root["iteration"] or root["span"]
+            return self._anchor.get(parent_run_id)
+
+        # -- chains: the executor run and its per-step planning chain --------
+
+        def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+            with self._lock:
+                if parent_run_id is None:
+                    name = (serialized or {}).get("name") or kwargs.get("name") or "AgentExecutor"
+                    span = self._open("run", name, None, {"input": _short(inputs.get("input", inputs))
+                                                          if isinstance(inputs, dict) else _short(inputs)})
+                    self._roots[run_id] = {"span": span, "iteration": None, "count": 0}
+                    self._anchor[run_id] = span
+                elif parent_run_id in self._roots:
+                    root = self._roots[parent_run_id]
+                    if root["iteration"] is not None:
+                        self._close(root["iteration"])
+                    root["count"] += 1
+                    root["iteration"] = self._open("iteration", f"iteration {root['count']}", root["span"],
+                                                   {"index": root["count"]})
+                    self._anchor[run_id] = root["iteration"]
+                else:
+                    self._anchor[run_id] = self._anchor.get(parent_run_id)
+
+        def _end_chain(self, run_id, status, outputs=None):
+            with self._lock:
+                self._anchor.pop(run_id, None)
+                root = self._roots.pop(run_id, None)
+                if root is None:
+                    return
+                if root["iteration"] is not None:
+                    self._close(root["iteration"], status)
+                attributes = {"iterations": root["count"]}
+                if isinstance(outputs, dict) and "output" in outputs:
+                    attributes["output_chars"] = len(str(outputs["output"]))
+                self._close(root["span"], status, **attributes)
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs):
+            self._end_chain(run_id, None, outputs)
+
+        def on_chain_error(self, error, *, run_id, **kwargs):
+            self._end_chain(run_id, "error")
+
+        # -- LLM calls --------------------------------------------------------
+
+        def _llm_start(self, serialized, run_id, parent_run_id, kwargs):
+            params = kwargs.get("invocation_params") or {}
+            model = params.get("model_name") or params.get("model") or (serialized or {}).get("name", "llm")
+            with self._lock:
+                self._open("llm", str(model), self._parent_for(parent_run_id), {"model": str(model)}, key=run_id)
+
+        def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+            self._llm_start(serialized, run_id, parent_run_id, kwargs)
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+            self._llm_start(serialized, run_id, parent_run_id, kwargs)
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            usage = dict((response.llm_output or {}).get("token_usage") or {})
+            if not usage and response.generations and response.generations[0]:
+                message = getattr(response.generations[0][0], "message", None)
+                meta = getattr(message, "usage_metadata", None) or {}
+                usage = {"prompt_tokens": meta.get("input_tokens"), "completion_tokens": meta.get("output_tokens")}
+            with self._lock:
+                span = self._spans.pop(run_id, None)
+                if span is not None:
+                    self._close(span, prompt_tokens=usage.get("prompt_tokens") or 0,
+                                completion_tokens=usage.get("completion_tokens") or 0)
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            with self._lock:
+                span = self._spans.pop(run_id, None)
+                if span is not None:
+                    self._close(span, "error", error=_short(str(error)))
+
+        # -- tool calls -------------------------------------------------------
+
+        def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+            name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+            kind = "parse_error" if name == "_Exception" else "tool"
+            with self._lock:
+                self._open(kind, name, self._parent_for(parent_run_id), {"input": _short(input_str)}, key=run_id)
+
+        def on_tool_end(self, output, *, run_id, **kwargs):
+            with self._lock:
+                span = self._spans.pop(run_id, None)
+                if span is not None:
+                    self._close(span, bytes=len(str(output).encode("utf-8")))
+
+        def on_tool_error(self, error, *, run_id, **kwargs):
+            with self._lock:
+                span = self._spans.pop(run_id, None)
+                if span is not None:
+                    self._close(span, "error", error=_short(str(error)))
+
+        def close(self):
+            self.exporter.close()
+
+    return TracingCallbackHandler
+
+
+def tracing_handler(path, fmt="jsonl"):
+    return _handler_class()(EXPORTERS[fmt](path))
+
+
+# ---------------------------------------------------------
+# Report
+# ---------------------------------------------------------
+def load_spans(paths, session=None):
+    """Spans from JSONL files, only those of `session` when given."""
+    spans = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            spans.extend(json.loads(line) for line in f if line.strip())
+    if session is not None:
+        spans = [s for s in spans if s.get("session") == session]
+    return spans
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+
+def summarize(spans):
+    """Breaks run time down by span kind/name; returns (rows, totals)."""
+    runs = [s for s in spans if s["kind"] == "run"]
+    run_ms = sum(s["duration_ms"] for s in runs)
+    groups = defaultdict(list)
+    for s in spans:
+        if s["kind"] in ("llm", "tool", "parse_error"):
+            groups[(s["kind"], s["name"])].append(s)
+
+    rows = []
+    accounted = 0.0
+    for (kind, name), items in sorted(groups.items(), key=lambda kv: -sum(s["duration_ms"] for s in kv[1])):
+        durations = [s["duration_ms"] for s in items]
+        accounted += sum(durations)
+        rows.append({
+            "kind": kind,
+            "name": name,
+            "calls": len(items),
+            "total_s": sum(durations) / 1000,
+            "share": sum(durations) / run_ms if run_ms else 0.0,
+            "p50_ms": _pct(durations, 0.50),
+            "p95_ms": _pct(durations, 0.95),
+            "errors": sum(s["status"] == "error" for s in items),
+        })
+    # whatever is not inside an LLM or tool span: prompt formatting, output parsing, callbacks
+    overhead = max(0.0, run_ms - accounted)
+    rows.append({"kind": "agent", "name": "overhead", "calls": len(runs), "total_s": overhead / 1000,
+                 "share": overhead / run_ms if run_ms else 0.0, "p50_ms": None, "p95_ms": None, "errors": 0})
+
+    llm = [s for s in spans if s["kind"] == "llm"]
+    totals = {
+        "runs": len(runs),
+        "run_p50_ms": _pct([s["duration_ms"] for s in runs], 0.50),
+        "run_p95_ms": _pct([s["duration_ms"] for s in runs], 0.95),
+        "failed_runs": sum(s["status"] == "error" for s in runs),
+        "iterations_per_run": statistics.mean([s["attributes"].get("iterations", 0) for s in runs]) if runs else 0,
+        "parse_errors": sum(s["kind"] == "parse_error" for s in spans),
+        "prompt_tokens": sum(s["attributes"].get("prompt_tokens", 0) for s in llm),
+        "completion_tokens": sum(s["attributes"].get("completion_tokens", 0) for s in llm),
+        "tool_bytes": sum(s["attributes"].get("bytes", 0) for s in spans if s["kind"] == "tool"),
+    }
+    return rows, totals
+
+
+def print_report(spans):
+    rows, totals = summarize(spans)
+    print(f"📊 {totals['runs']} runs ({totals['failed_runs']} failed) | run p50 {totals['run_p50_ms'] / 1000:.2f} s "
+          f"p95 {totals['run_p95_ms'] / 1000:.2f} s | {totals['iterations_per_run']:.1f} iterations/run | "
+          f"{totals['parse_errors']} parse retries")
+    print(f"   tokens: {totals['prompt_tokens']} prompt, {totals['completion_tokens']} completion | "
+          f"tool output: {totals['tool_bytes'] / 1024:.1f} KiB")
+    print(f"{'kind':<12} {'name':<32} {'calls':>6} {'total s':>9} {'share':>7} {'p50 ms':>9} {'p95 ms':>9}")
+    for r in rows:
+        p50 = f"{r['p50_ms']:9.0f}" if r["p50_ms"] is not None else f"{'-':>9}"
+        p95 = f"{r['p95_ms']:9.0f}" if r["p95_ms"] is not None else f"{'-':>9}"
+        errors = f"  ({r['errors']} errors)" if r["errors"] else ""
+        print(f"{r['kind']:<12} {r['name'][:32]:<32} {r['calls']:>6} {r['total_s']:9.2f} {r['share']:7.1%} "
+              f"{p50} {p95}{errors}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize agent traces: where did the time go?")
+    parser.add_argument("traces", nargs="+", help="JSONL span files written by tracing_handler()")
+    parser.add_argument("--session", help="only the spans of this session id")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    spans = load_spans(args.traces, args.session)
+    if not spans:
+        sys.exit("no spans found")
+    if args.json:
+        rows, totals = summarize(spans)
+        print(json.dumps({"totals": totals, "rows": rows}, indent=2))
+    else:
+        print_report(spans)